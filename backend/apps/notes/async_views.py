@@ -0,0 +1,154 @@
+"""
+Native async handlers for the hot read endpoints (notes list, note detail,
+summary), served when NOTES_ASYNC_VIEWS is on under an ASGI server.
+
+DRF's APIView is sync-only, so these are plain Django async views that
+authenticate with AsyncJWTAuthentication, read through the async ORM and
+render with apps.notes.fast_serializers, producing the same bytes as the
+sync views. Anything they don't cover (writes, ?fields=, the browsable
+API) is handed to the sync view.
+"""
+
+import functools
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+
+from apps.notes import fast_serializers, views
+from apps.notes.conditional import (
+    aconditional,
+    anotes_state,
+    etag_for_version,
+    library_etag_for,
+)
+from apps.notes.counters import category_counts, summarize_categories
+from apps.notes.models import Note
+from apps.notes.pagination import InvalidCursor, keyset_page, parse_page_size, split_page
+from apps.users.authentication import AsyncJWTAuthentication
+from config.renderers import CompactJSONRenderer
+
+authentication = AsyncJWTAuthentication()
+
+
+def _json(body: bytes, status: int = 200) -> HttpResponse:
+    return HttpResponse(body, status=status, content_type="application/json")
+
+
+def _error(detail, status: int) -> HttpResponse:
+    data = detail if isinstance(detail, dict) else {"detail": detail}
+    return _json(CompactJSONRenderer().render(data), status=status)
+
+
+async def _arows(qs, fields, chunk_size: int = 100) -> list[tuple]:
+    # ValuesListIterable runs its query as soon as it is created, which
+    # QuerySet.aiterator() does on the event loop (SynchronousOnlyOperation);
+    # stream .values() instead, whose iterator is lazy, and rebuild the tuples.
+    return [
+        tuple(row.values())
+        async for row in qs.values(*fields).aiterator(chunk_size=chunk_size)
+    ]
+
+
+def _wants_json(request) -> bool:
+    return "format" not in request.GET and "text/html" not in request.headers.get("Accept", "")
+
+
+def async_read_view(sync_view_class, serves=_wants_json):
+    """
+    Serve GET/HEAD with the decorated coroutine and delegate every other
+    request to the sync DRF view.
+    """
+    sync_view = sync_to_async(sync_view_class.as_view())
+
+    def decorator(handler):
+        @csrf_exempt
+        @functools.wraps(handler)
+        async def view(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD") or not serves(request):
+                return await sync_view(request, *args, **kwargs)
+            try:
+                authenticated = await authentication.aauthenticate(request)
+            except exceptions.AuthenticationFailed as exc:
+                response = _error(exc.detail, exc.status_code)
+            else:
+                if authenticated is None:
+                    response = _error(
+                        exceptions.NotAuthenticated.default_detail,
+                        exceptions.NotAuthenticated.status_code,
+                    )
+                else:
+                    request.user = authenticated[0]
+                    response = await handler(request, request.user, *args, **kwargs)
+            if response.status_code == 401:
+                response["WWW-Authenticate"] = authentication.authenticate_header(request)
+            patch_vary_headers(response, ["Accept"])
+            return response
+
+        return view
+
+    return decorator
+
+
+def _serves_list(request) -> bool:
+    return (
+        settings.NOTES_FAST_SERIALIZATION
+        and _wants_json(request)
+        and "fields" not in request.GET
+        and request.GET.get("view") != "compact"
+    )
+
+
+@async_read_view(views.NotesListCreateView, serves=_serves_list)
+async def notes_list(request, user):
+    version, updated_at = await anotes_state(user.id)
+
+    async def build():
+        qs = Note.objects.filter(user_id=user.id)
+        category_name = request.GET.get("category")
+        if category_name:
+            qs = qs.filter(category__name=category_name)
+        columns = fast_serializers.NOTE_COLUMNS
+
+        cursor = request.GET.get("cursor")
+        limit = request.GET.get("limit")
+        if cursor is None and limit is None:
+            rows = await _arows(qs, columns, chunk_size=settings.NOTES_PAGE_SIZE)
+            return _json(fast_serializers.encode_notes(rows))
+        try:
+            page_size = parse_page_size(limit)
+            page = keyset_page(qs, cursor, page_size)
+        except InvalidCursor as exc:
+            return _error(str(exc), 400)
+        rows, next_cursor = split_page(
+            await _arows(page, columns), page_size, key=fast_serializers.row_key
+        )
+        return _json(fast_serializers.encode_page(rows, next_cursor))
+
+    return await aconditional(request, library_etag_for(user.id, version), updated_at, build)
+
+
+@async_read_view(views.NoteDetailView)
+async def note_detail(request, user, note_id):
+    row = await fast_serializers.note_rows(Note.objects.filter(id=note_id, user_id=user.id)).afirst()
+    if row is None:
+        return _error("Not found.", 404)
+
+    async def build():
+        return _json(fast_serializers.encode_note(row))
+
+    return await aconditional(request, etag_for_version(row[0], row[4]), row[4], build)
+
+
+@async_read_view(views.NotesSummaryView)
+async def notes_summary(request, user):
+    version, updated_at = await anotes_state(user.id)
+
+    async def build():
+        rows = await _arows(category_counts(user.id), ("name", "color_hex", "count"))
+        return _json(fast_serializers.dumps(summarize_categories(rows)))
+
+    return await aconditional(request, library_etag_for(user.id, version), updated_at, build)
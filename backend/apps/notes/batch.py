@@ -0,0 +1,192 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.notes import counters
+from apps.notes.cache import get_user_categories
+from apps.notes.models import (
+    DEFAULT_NOTE_CONTENT,
+    DEFAULT_NOTE_TITLE,
+    Category,
+    Note,
+    NoteTombstone,
+)
+from apps.notes.search import get_search_backend
+from apps.notes.serializers import NoteCreateSerializer, NoteSerializer, NoteUpdateSerializer
+
+NOT_FOUND = {"status": 404, "detail": "Not found."}
+
+
+class BatchError(ValueError):
+    pass
+
+
+def _invalid(field: str, message: str) -> dict:
+    return {"status": 400, "errors": {field: [message]}}
+
+
+def _validate(operations):
+    if not isinstance(operations, list):
+        raise BatchError("operations must be a list.")
+    if len(operations) > settings.NOTES_BATCH_MAX_SIZE:
+        raise BatchError(f"At most {settings.NOTES_BATCH_MAX_SIZE} operations per batch.")
+
+    parsed = []
+    for operation in operations:
+        if not isinstance(operation, dict):
+            parsed.append((None, None, _invalid("op", "Unknown operation.")))
+            continue
+        op, note_id = operation.get("op"), operation.get("id")
+
+        if op not in ("create", "update", "delete"):
+            parsed.append((op, note_id, _invalid("op", "Unknown operation.")))
+            continue
+        if op == "create":
+            note_id = None
+        elif not isinstance(note_id, int):
+            parsed.append((op, note_id, _invalid("id", "A note id is required.")))
+            continue
+        if op == "delete":
+            parsed.append((op, note_id, {}))
+            continue
+
+        if op == "create":
+            serializer = NoteCreateSerializer(data=operation)
+        else:
+            serializer = NoteUpdateSerializer(data=operation, partial=True)
+        if serializer.is_valid():
+            parsed.append((op, note_id, serializer.validated_data))
+        else:
+            parsed.append((op, note_id, {"status": 400, "errors": serializer.errors}))
+    return parsed
+
+
+@transaction.atomic
+def run_batch(user, operations) -> list[dict]:
+    """
+    Apply create/update/delete operations for one user in a single
+    transaction, using one category lookup, one fetch of the targeted notes
+    and bulk writes. Returns one result per operation, in order; invalid or
+    missing items are reported and skipped.
+    """
+    parsed = _validate(operations)
+
+    categories = {category.name: category for category in get_user_categories(user.id)}
+
+    def resolve_category(name):
+        category = categories.get(name or "Random Thoughts") or categories.get("Random Thoughts")
+        if category is None:
+            category = Category.objects.create(
+                user=user, name="Random Thoughts", color_hex="#EF9C66"
+            )
+            categories[category.name] = category
+        return category
+
+    target_ids = {note_id for op, note_id, _ in parsed if op in ("update", "delete") and note_id}
+    existing = {
+        note.id: note
+        for note in Note.objects.select_related("category")
+        .select_for_update(of=("self",))
+        .filter(user=user, id__in=target_ids)
+    }
+    # Counter state as stored, before this batch touches anything.
+    original_states = {note_id: note.counter_state() for note_id, note in existing.items()}
+
+    now = timezone.now()
+    results = []
+    created, updated, update_fields, deleted = [], {}, set(), {}
+
+    for op, note_id, data in parsed:
+        if "status" in data:
+            results.append({"op": op, "id": note_id, **data})
+            continue
+
+        if op == "create":
+            note = Note(
+                user=user,
+                category=resolve_category(data.get("category_name")),
+                title=data.get("title") or DEFAULT_NOTE_TITLE,
+                content=data.get("content") or DEFAULT_NOTE_CONTENT,
+            )
+            note.refresh_placeholder()
+            created.append(note)
+            results.append({"op": op, "id": None, "status": 201, "note": note})
+            continue
+
+        note = existing.get(note_id)
+        if note is None or note_id in deleted:
+            results.append({"op": op, "id": note_id, **NOT_FOUND})
+            continue
+
+        if op == "delete":
+            deleted[note_id] = note
+            updated.pop(note_id, None)
+            results.append({"op": op, "id": note_id, "status": 204})
+            continue
+
+        category = None
+        if data.get("category_name"):
+            # Like PATCH /api/notes/<id>: an update never falls back to
+            # another category.
+            category = categories.get(data["category_name"])
+            if category is None:
+                results.append(
+                    {"op": op, "id": note_id, **_invalid("category_name", "Invalid category")}
+                )
+                continue
+
+        changed = set()
+        if category is not None:
+            if category.id != note.category_id:
+                note.category = category
+                changed.add("category")
+        for key in ("title", "content"):
+            if key in data and getattr(note, key) != data[key]:
+                setattr(note, key, data[key])
+                changed.add(key)
+        if changed:
+            note.updated_at = now
+            note.refresh_placeholder()
+            updated[note_id] = note
+            update_fields |= changed | {"updated_at", "is_placeholder"}
+        results.append({"op": op, "id": note_id, "status": 200, "note": note})
+
+    # Bulk writes bypass the Note signals, so the bookkeeping they do is
+    # applied here once for the whole batch. Every write in the batch shares
+    # one change number.
+    if created or updated or deleted:
+        change_seq = counters.bump_version(user.id, notes_delta=len(created) - len(deleted))
+    if created:
+        for note in created:
+            note.change_seq = change_seq
+        Note.objects.bulk_create(created)
+    if updated:
+        for note in updated.values():
+            note.change_seq = change_seq
+        Note.objects.bulk_update(updated.values(), sorted(update_fields | {"change_seq"}))
+    if deleted:
+        Note.objects.filter(id__in=list(deleted))._raw_delete(Note.objects.db)
+        NoteTombstone.objects.bulk_create(
+            [
+                NoteTombstone(user=user, note_id=note_id, change_seq=change_seq)
+                for note_id in deleted
+            ]
+        )
+
+    search_backend = get_search_backend()
+    search_backend.index_notes([*created, *updated.values()])
+    search_backend.remove_notes(deleted)
+
+    changes = [(None, note.counter_state()) for note in created]
+    changes += [
+        (original_states[note_id], note.counter_state()) for note_id, note in updated.items()
+    ]
+    changes += [(original_states[note_id], None) for note_id in deleted]
+    if changes:
+        counters.apply_note_changes(user.id, changes)
+
+    for result in results:
+        if "note" in result:
+            result["id"] = result["note"].id
+            result["note"] = NoteSerializer(result["note"]).data
+    return results
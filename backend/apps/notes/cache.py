@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from apps.notes.models import Category
+from config.cache import MISSING, LocalTTLCache
+
+_category_config = settings.NOTES_CATEGORY_CACHE
+_local_categories = LocalTTLCache(_category_config["MAX_USERS"], _category_config["TTL"])
+
+
+def _shared_cache():
+    alias = _category_config["BACKEND"]
+    return caches[alias] if alias else None
+
+
+def _shared_key(user_id: int) -> str:
+    return f"notes:categories:{user_id}"
+
+
+def _load_rows(user_id: int) -> tuple:
+    rows = _local_categories.get(user_id)
+    if rows is not MISSING:
+        return rows
+
+    shared = _shared_cache()
+    if shared is not None:
+        rows = shared.get(_shared_key(user_id))
+        if rows is not None:
+            _local_categories.set(user_id, rows)
+            return rows
+
+    rows = tuple(
+        Category.objects.filter(user_id=user_id)
+        .order_by("id")
+        .values_list("id", "name", "color_hex")
+    )
+    _local_categories.set(user_id, rows)
+    if shared is not None:
+        shared.set(_shared_key(user_id), rows, _category_config["TTL"])
+    return rows
+
+
+def _to_category(user_id: int, row) -> Category:
+    category_id, name, color_hex = row
+    return Category.from_db(
+        Category.objects.db,
+        ["id", "user_id", "name", "color_hex"],
+        [category_id, user_id, name, color_hex],
+    )
+
+
+def get_user_categories(user_id: int) -> list[Category]:
+    """
+    The user's categories ordered by id, served from cache when possible.
+    created_at is deferred on the returned instances.
+    """
+    return [_to_category(user_id, row) for row in _load_rows(user_id)]
+
+
+def get_category(user_id: int, name: str) -> Category | None:
+    for row in _load_rows(user_id):
+        if row[1] == name:
+            return _to_category(user_id, row)
+    return None
+
+
+def invalidate_user_categories(user_id: int) -> None:
+    def _invalidate():
+        _local_categories.delete(user_id)
+        shared = _shared_cache()
+        if shared is not None:
+            shared.delete(_shared_key(user_id))
+
+    _invalidate()
+    # Drop again once the write is visible, so a concurrent reader cannot
+    # re-cache the pre-commit state.
+    transaction.on_commit(_invalidate)
+
+
+def clear_category_cache() -> None:
+    _local_categories.clear()
@@ -0,0 +1,126 @@
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_headers
+
+from apps.notes.models import Note, UserNotesState
+
+
+def _state_query(user_id):
+    return UserNotesState.objects.filter(user_id=user_id).values_list("version", "updated_at")
+
+
+def _notes_state(request):
+    # etag and last_modified are both evaluated per request; read the row once.
+    if not hasattr(request, "_notes_state"):
+        request._notes_state = _state_query(request.user.id).first() or (0, None)
+    return request._notes_state
+
+
+async def anotes_state(user_id):
+    return await _state_query(user_id).afirst() or (0, None)
+
+
+def library_etag_for(user_id, version) -> str:
+    return f'W/"{user_id}.{version}"'
+
+
+def library_etag(request, *args, **kwargs):
+    version, _ = _notes_state(request)
+    return library_etag_for(request.user.id, version)
+
+
+def library_last_modified(request, *args, **kwargs):
+    _, updated_at = _notes_state(request)
+    return updated_at
+
+
+def get_user_note(request, note_id):
+    """
+    Fetch (and memoize on the request) one of the user's notes, so the
+    validators and the view body share a single query.
+    """
+    cache = request.__dict__.setdefault("_notes_by_id", {})
+    if note_id not in cache:
+        cache[note_id] = (
+            Note.objects.select_related("category").filter(id=note_id, user=request.user).first()
+        )
+    note = cache[note_id]
+    if note is None:
+        raise Note.DoesNotExist
+    return note
+
+
+def etag_for_version(note_id, updated_at) -> str:
+    return f'"{note_id}.{updated_at.timestamp():.6f}"'
+
+
+def etag_for_note(note: Note) -> str:
+    return etag_for_version(note.id, note.updated_at)
+
+
+def note_etag(request, note_id):
+    try:
+        note = get_user_note(request, note_id)
+    except Note.DoesNotExist:
+        return None
+    return etag_for_note(note)
+
+
+def note_last_modified(request, note_id):
+    try:
+        return get_user_note(request, note_id).updated_at
+    except Note.DoesNotExist:
+        return None
+
+
+def check_write_preconditions(request, note: Note):
+    """
+    Evaluate If-Match / If-Unmodified-Since against the note's current
+    version. Returns a 412 response when a stale client tries to write.
+    """
+    return get_conditional_response(
+        request,
+        etag=etag_for_note(note),
+        last_modified=int(note.updated_at.timestamp()),
+    )
+
+
+def conditional_get(etag_func, last_modified_func):
+    """
+    Method decorator for per-user GET endpoints: answers If-None-Match /
+    If-Modified-Since with 304 before the view runs, and asks clients to
+    revalidate instead of reusing responses blindly.
+    """
+
+    def decorator(view_method):
+        view_method = method_decorator(condition(etag_func, last_modified_func))(view_method)
+        view_method = method_decorator(vary_on_headers("Authorization"))(view_method)
+        return method_decorator(cache_control(private=True, no_cache=True))(view_method)
+
+    return decorator
+
+
+async def aconditional(request, etag, last_modified, build_response):
+    """
+    What conditional_get() does, for async views whose validators were read
+    with the async ORM: answer with 304 when the client is current, otherwise
+    await build_response().
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    if response is None:
+        response = await build_response()
+    if response.status_code in (200, 304):
+        if etag and not response.has_header("ETag"):
+            response["ETag"] = etag
+        if last_modified and not response.has_header("Last-Modified"):
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+    patch_vary_headers(response, ["Authorization"])
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,244 @@
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.notes.models import Category, Note, NoteCategoryCounter, UserNotesState
+
+
+def adjust_counter(user_id: int, category_id: int, delta: int) -> None:
+    if not delta:
+        return
+    updated = NoteCategoryCounter.objects.filter(category_id=category_id).update(
+        visible_count=F("visible_count") + delta
+    )
+    if updated:
+        return
+    _, created = NoteCategoryCounter.objects.get_or_create(
+        category_id=category_id,
+        defaults={"user_id": user_id, "visible_count": delta},
+    )
+    if not created:
+        NoteCategoryCounter.objects.filter(category_id=category_id).update(
+            visible_count=F("visible_count") + delta
+        )
+
+
+def _increment_state(user_id: int, notes_delta: int, now) -> int | None:
+    """
+    Apply a version bump to an existing state row and return the new
+    version, or None when the user has no row yet. Where the database
+    supports UPDATE ... RETURNING this is a single statement.
+    """
+    state = UserNotesState.objects.filter(user_id=user_id)
+    changes = {"version": F("version") + 1, "note_count": F("note_count") + notes_delta}
+    if not connection.features.can_return_columns_from_insert:
+        if not state.update(updated_at=now, **changes):
+            return None
+        return state.values_list("version", flat=True).get()
+
+    qn = connection.ops.quote_name
+    column = {
+        name: qn(UserNotesState._meta.get_field(name).column)
+        for name in ("user", "version", "note_count", "updated_at")
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {qn(UserNotesState._meta.db_table)} "
+            f"SET {column['version']} = {column['version']} + 1, "
+            f"{column['note_count']} = {column['note_count']} + %s, "
+            f"{column['updated_at']} = %s "
+            f"WHERE {column['user']} = %s RETURNING {column['version']}",
+            [notes_delta, connection.ops.adapt_datetimefield_value(now), user_id],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def bump_version(user_id: int, notes_delta: int = 0) -> int:
+    """
+    Record a write to the user's library; notes_delta is the net number of
+    notes created (positive) or deleted (negative) by it. Returns the new
+    version, which is also the change number to stamp on the written notes
+    and tombstones: the UPDATE holds the state row's lock until the caller's
+    transaction ends, so run it in the same transaction as the write and a
+    user's change numbers become visible in commit order.
+    """
+    now = timezone.now()
+    with transaction.atomic(savepoint=False):
+        version = _increment_state(user_id, notes_delta, now)
+        if version is not None:
+            return version
+        _, created = UserNotesState.objects.get_or_create(
+            user_id=user_id,
+            defaults={"version": 1, "note_count": max(notes_delta, 0), "updated_at": now},
+        )
+        if created:
+            return 1
+        return _increment_state(user_id, notes_delta, now)
+
+
+def has_notes(user_id: int) -> bool:
+    return UserNotesState.objects.filter(user_id=user_id, note_count__gt=0).exists()
+
+
+def summarize_categories(rows) -> dict:
+    """
+    Build the notes summary payload from (name, color_hex, visible_count) rows.
+    """
+    categories = [
+        {"name": name, "color_hex": color_hex, "count": count} for name, color_hex, count in rows
+    ]
+    total_notes = sum(item["count"] for item in categories)
+    return {
+        "has_notes": total_notes > 0,
+        "total_notes": total_notes,
+        "default_category": "Random Thoughts",
+        "categories": categories,
+    }
+
+
+def category_counts(user_id: int):
+    # Counts come from NoteCategoryCounter, kept in step with every note write.
+    return (
+        Category.objects.filter(user_id=user_id)
+        .order_by("id")
+        .annotate(count=Coalesce(F("counter__visible_count"), 0))
+    )
+
+
+def library_overview(user_id: int) -> tuple[dict, bool]:
+    """
+    The notes summary plus whether the user has any note at all, read in a
+    single query: the note count rides along on every category row.
+    """
+    note_count = UserNotesState.objects.filter(user_id=OuterRef("user_id")).values("note_count")
+    rows = list(
+        category_counts(user_id)
+        .annotate(note_count=Subquery(note_count[:1]))
+        .values_list("name", "color_hex", "count", "note_count")
+    )
+    if not rows:
+        return summarize_categories([]), has_notes(user_id)
+    return summarize_categories(row[:3] for row in rows), bool(rows[0][3])
+
+
+def apply_note_changes(user_id: int, changes) -> None:
+    """
+    Apply the net counter deltas for (old_state, new_state) pairs of
+    (category_id, is_visible). Either side may be None for a create or delete.
+    """
+    deltas = Counter()
+    for old_state, new_state in changes:
+        if old_state is not None and old_state[1]:
+            deltas[old_state[0]] -= 1
+        if new_state is not None and new_state[1]:
+            deltas[new_state[0]] += 1
+    for category_id, delta in deltas.items():
+        adjust_counter(user_id, category_id, delta)
+
+
+def apply_note_change(user_id: int, old_state, new_state) -> None:
+    apply_note_changes(user_id, [(old_state, new_state)])
+
+
+def compute_visible_counts(user_id: int | None = None) -> dict[int, int]:
+    qs = Note.objects.filter(is_placeholder=False)
+    if user_id is not None:
+        qs = qs.filter(user_id=user_id)
+    rows = qs.order_by().values("category_id").annotate(count=Count("id"))
+    return {row["category_id"]: row["count"] for row in rows}
+
+
+def find_counter_drift(user_id: int | None = None) -> dict[int, tuple[int, int]]:
+    """
+    Return {category_id: (stored, actual)} for every counter that disagrees
+    with the Note table.
+    """
+    actual = compute_visible_counts(user_id)
+    categories = Category.objects.all()
+    if user_id is not None:
+        categories = categories.filter(user_id=user_id)
+    stored = {
+        row["id"]: row["counter__visible_count"] or 0
+        for row in categories.values("id", "counter__visible_count")
+    }
+    drift = {}
+    for category_id in stored.keys() | actual.keys():
+        pair = (stored.get(category_id, 0), actual.get(category_id, 0))
+        if pair[0] != pair[1]:
+            drift[category_id] = pair
+    return drift
+
+
+def compute_note_counts(user_id: int | None = None) -> dict[int, int]:
+    qs = Note.objects.all()
+    if user_id is not None:
+        qs = qs.filter(user_id=user_id)
+    return dict(qs.order_by().values_list("user_id").annotate(count=Count("id")))
+
+
+def find_note_count_drift(user_id: int | None = None) -> dict[int, tuple[int, int]]:
+    """
+    Return {user_id: (stored, actual)} for every UserNotesState.note_count
+    that disagrees with the Note table.
+    """
+    actual = compute_note_counts(user_id)
+    states = UserNotesState.objects.all()
+    if user_id is not None:
+        states = states.filter(user_id=user_id)
+    stored = dict(states.values_list("user_id", "note_count"))
+    drift = {}
+    for owner_id in stored.keys() | actual.keys():
+        pair = (stored.get(owner_id, 0), actual.get(owner_id, 0))
+        if pair[0] != pair[1]:
+            drift[owner_id] = pair
+    return drift
+
+
+@transaction.atomic
+def rebuild_note_counts(user_id: int | None = None) -> int:
+    actual = compute_note_counts(user_id)
+    states = UserNotesState.objects.all()
+    if user_id is not None:
+        states = states.filter(user_id=user_id)
+    states.exclude(user_id__in=list(actual)).update(note_count=0)
+    now = timezone.now()
+    UserNotesState.objects.bulk_create(
+        [
+            UserNotesState(user_id=owner_id, note_count=count, updated_at=now)
+            for owner_id, count in actual.items()
+        ],
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["note_count"],
+    )
+    return len(actual)
+
+
+@transaction.atomic
+def rebuild_counters(user_id: int | None = None) -> int:
+    actual = compute_visible_counts(user_id)
+    categories = Category.objects.all()
+    if user_id is not None:
+        categories = categories.filter(user_id=user_id)
+
+    counters = [
+        NoteCategoryCounter(
+            category_id=category_id,
+            user_id=owner_id,
+            visible_count=actual.get(category_id, 0),
+        )
+        for category_id, owner_id in categories.values_list("id", "user_id").iterator()
+    ]
+    NoteCategoryCounter.objects.bulk_create(
+        counters,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["category"],
+        update_fields=["visible_count"],
+    )
+    return len(counters)
@@ -0,0 +1,88 @@
+"""
+Hand-rolled JSON rendering for the hot notes list path.
+
+Produces the same bytes as NoteSerializer + DRF's JSONRenderer, but reads
+plain tuples via values_list() and skips the per-field serializer
+machinery. Category objects are encoded once per response and spliced in.
+"""
+
+import json
+
+from django.utils import timezone
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+NOTE_COLUMNS = (
+    "id",
+    "title",
+    "content",
+    "created_at",
+    "updated_at",
+    "category_id",
+    "category__name",
+    "category__color_hex",
+)
+
+
+def _dumps_python(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _dumps_orjson(value) -> bytes:
+    return orjson.dumps(value)
+
+
+_dumps = _dumps_orjson if orjson is not None else _dumps_python
+
+
+def dumps(value) -> bytes:
+    # Match DRF: always escape the two JS-hostile line separators.
+    return _dumps(value).replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+
+def format_datetime(value) -> str | None:
+    # Same output as rest_framework.fields.DateTimeField with ISO 8601.
+    if value is None:
+        return None
+    value = timezone.localtime(value).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def note_rows(qs):
+    return qs.values_list(*NOTE_COLUMNS)
+
+
+def row_key(row):
+    # (updated_at, id) of a note_rows() tuple, for keyset pagination.
+    return row[4], row[0]
+
+
+def encode_note(row, category_fragments: dict[int, bytes] | None = None) -> bytes:
+    note_id, title, content, created_at, updated_at, category_id, name, color_hex = row
+    category = None if category_fragments is None else category_fragments.get(category_id)
+    if category is None:
+        category = dumps({"id": category_id, "name": name, "color_hex": color_hex})
+        if category_fragments is not None:
+            category_fragments[category_id] = category
+    return b'{"id":%d,"category":%b,"title":%b,"content":%b,"created_at":%b,"updated_at":%b}' % (
+        note_id,
+        category,
+        dumps(title),
+        dumps(content),
+        dumps(format_datetime(created_at)),
+        dumps(format_datetime(updated_at)),
+    )
+
+
+def encode_notes(rows) -> bytes:
+    category_fragments: dict[int, bytes] = {}
+    return b"[" + b",".join(encode_note(row, category_fragments) for row in rows) + b"]"
+
+
+def encode_page(rows, next_cursor: str | None) -> bytes:
+    return b'{"results":%b,"next_cursor":%b}' % (encode_notes(rows), dumps(next_cursor))
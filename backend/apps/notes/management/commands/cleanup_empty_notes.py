@@ -1,14 +1,120 @@
-from django.core.management.base import BaseCommand
+import re
+import time
+from collections import Counter
+from datetime import timedelta
 
-from apps.notes.models import Note
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.notes.counters import bump_version
+from apps.notes.models import Note, NoteTombstone
+from apps.notes.search import get_search_backend
+
+DURATION_RE = re.compile(r"^(\d+)([smhd]?)$")
+DURATION_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "": "days"}
+
+
+def parse_duration(value: str) -> timedelta:
+    match = DURATION_RE.match(value.strip())
+    if not match:
+        raise CommandError(f"Invalid duration {value!r}; use e.g. 30m, 12h or 7d.")
+    amount, unit = match.groups()
+    return timedelta(**{DURATION_UNITS[unit]: int(amount)})
 
 
 class Command(BaseCommand):
     help = "Delete notes that only contain default title/content placeholders."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows deleted per transaction (default 1000).",
+        )
+        parser.add_argument(
+            "--sleep-between-batches",
+            type=float,
+            default=0.0,
+            help="Seconds to pause between batches to let other writers through.",
+        )
+        parser.add_argument(
+            "--older-than",
+            help="Only delete notes not updated for this long (e.g. 30m, 12h, 7d).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count matching notes without deleting them.",
+        )
+
     def handle(self, *args, **options):
-        deleted, _ = Note.objects.filter(
-            title="Note Title",
-            content="Pour your heart out...",
-        ).delete()
-        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} empty notes."))
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        pause = options["sleep_between_batches"]
+        dry_run = options["dry_run"]
+
+        qs = Note.objects.filter(is_placeholder=True)
+        if options["older_than"]:
+            qs = qs.filter(updated_at__lt=timezone.now() - parse_duration(options["older_than"]))
+
+        total = 0
+        batches = 0
+        last_id = 0
+        started = time.perf_counter()
+        while True:
+            rows = list(
+                qs.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", "user_id")[:batch_size]
+            )
+            if not rows:
+                break
+            ids = [note_id for note_id, _ in rows]
+            last_id = ids[-1]
+
+            if dry_run:
+                deleted = len(ids)
+            else:
+                # Placeholder notes have no dependents and do not affect the
+                # visible-note counters, so skip the ORM collector entirely.
+                # The predicate is re-checked under lock in case a note was
+                # edited since it was selected.
+                with transaction.atomic():
+                    locked = list(
+                        qs.filter(id__in=ids).select_for_update().values_list("id", "user_id")
+                    )
+                    deleted = Note.objects.filter(
+                        id__in=[note_id for note_id, _ in locked]
+                    )._raw_delete(qs.db)
+                    change_seqs = {
+                        user_id: bump_version(user_id, notes_delta=-count)
+                        for user_id, count in Counter(user_id for _, user_id in locked).items()
+                    }
+                    NoteTombstone.objects.bulk_create(
+                        [
+                            NoteTombstone(
+                                user_id=user_id, note_id=note_id, change_seq=change_seqs[user_id]
+                            )
+                            for note_id, user_id in locked
+                        ]
+                    )
+                    get_search_backend().remove_notes(note_id for note_id, _ in locked)
+
+            total += deleted
+            batches += 1
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"Batch {batches}: {deleted} rows, {total} total, "
+                f"{total / elapsed if elapsed else 0:.0f} rows/s"
+            )
+            if pause and len(ids) == batch_size:
+                time.sleep(pause)
+
+        elapsed = time.perf_counter() - started
+        verb = "Would delete" if dry_run else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {total} empty notes in {batches} batches ({elapsed:.2f}s).")
+        )
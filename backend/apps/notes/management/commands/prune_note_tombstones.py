@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from apps.notes.management.commands.cleanup_empty_notes import parse_duration
+from apps.notes.models import NoteTombstone, UserNotesState
+
+
+class Command(BaseCommand):
+    help = "Delete note tombstones older than the sync retention horizon."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            default=settings.NOTES_TOMBSTONE_RETENTION,
+            help="Retention horizon (e.g. 12h, 30d; default NOTES_TOMBSTONE_RETENTION).",
+        )
+
+    def handle(self, *args, **options):
+        horizon = timezone.now() - parse_duration(options["older_than"])
+        expired = (
+            NoteTombstone.objects.filter(deleted_at__lt=horizon)
+            .order_by()
+            .values_list("user_id")
+            .annotate(last_seq=Max("change_seq"))
+        )
+        total = 0
+        for user_id, last_seq in expired:
+            # Raise the user's horizon before dropping the rows, so a sync
+            # token that still needs them is refused rather than served short.
+            with transaction.atomic():
+                UserNotesState.objects.filter(user_id=user_id).update(
+                    tombstones_pruned_seq=Greatest("tombstones_pruned_seq", last_seq)
+                )
+                deleted, _ = NoteTombstone.objects.filter(
+                    user_id=user_id, change_seq__lte=last_seq
+                ).delete()
+            total += deleted
+        self.stdout.write(f"Pruned {total} tombstones.")
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.notes.counters import (
+    find_counter_drift,
+    find_note_count_drift,
+    rebuild_counters,
+    rebuild_note_counts,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild or verify the per-category visible note counters and the per-user "
+        "note counts against the Note table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Only process this user id.")
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Report counters that disagree with the Note table without changing them.",
+        )
+
+    def handle(self, *args, **options):
+        user_id = options["user"]
+
+        if options["verify"]:
+            drift = find_counter_drift(user_id)
+            for category_id, (stored, actual) in sorted(drift.items()):
+                self.stdout.write(f"category {category_id}: stored={stored} actual={actual}")
+            count_drift = find_note_count_drift(user_id)
+            for owner_id, (stored, actual) in sorted(count_drift.items()):
+                self.stdout.write(f"user {owner_id}: stored={stored} actual={actual}")
+            if drift or count_drift:
+                raise CommandError(f"{len(drift) + len(count_drift)} counters out of date.")
+            self.stdout.write(self.style.SUCCESS("All counters match."))
+            return
+
+        rebuilt = rebuild_counters(user_id)
+        users = rebuild_note_counts(user_id)
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {rebuilt} counters and note counts for {users} users.")
+        )
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notes", "0002_note"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="note",
+            options={"ordering": ["-updated_at", "-id"]},
+        ),
+        migrations.AddIndex(
+            model_name="note",
+            index=models.Index(fields=["user", "-updated_at", "-id"], name="note_user_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="note",
+            index=models.Index(
+                fields=["user", "category", "-updated_at", "-id"],
+                name="note_user_cat_updated_idx",
+            ),
+        ),
+    ]
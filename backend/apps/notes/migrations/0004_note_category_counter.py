@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+
+
+def backfill_counters(apps, schema_editor):
+    Category = apps.get_model("notes", "Category")
+    Note = apps.get_model("notes", "Note")
+    NoteCategoryCounter = apps.get_model("notes", "NoteCategoryCounter")
+
+    counts = {
+        row["category_id"]: row["count"]
+        for row in Note.objects.filter(
+            ~Q(title="Note Title", content="Pour your heart out...")
+        )
+        .order_by()
+        .values("category_id")
+        .annotate(count=Count("id"))
+    }
+    NoteCategoryCounter.objects.bulk_create(
+        [
+            NoteCategoryCounter(
+                category_id=category_id,
+                user_id=user_id,
+                visible_count=counts.get(category_id, 0),
+            )
+            for category_id, user_id in Category.objects.values_list("id", "user_id").iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notes", "0003_note_list_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NoteCategoryCounter",
+            fields=[
+                (
+                    "category",
+                    models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="counter", serialize=False, to="notes.category"),
+                ),
+                ("visible_count", models.IntegerField(default=0)),
+                (
+                    "user",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="note_counters", to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+
+def backfill_is_placeholder(apps, schema_editor):
+    Note = apps.get_model("notes", "Note")
+    Note.objects.exclude(title="Note Title", content="Pour your heart out...").update(
+        is_placeholder=False
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notes", "0004_note_category_counter"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="note",
+            name="is_placeholder",
+            field=models.BooleanField(default=True),
+        ),
+        migrations.RunPython(backfill_is_placeholder, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="note",
+            index=models.Index(
+                condition=models.Q(("is_placeholder", False)),
+                fields=["user", "category"],
+                name="note_visible_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="note",
+            index=models.Index(
+                condition=models.Q(("is_placeholder", True)),
+                fields=["id"],
+                name="note_placeholder_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notes", "0006_user_notes_state"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    # Upserts are read through note_user_updated_idx from 0003, scanned in
+    # ascending order; only deletions need a new index.
+    operations = [
+        migrations.CreateModel(
+            name="NoteTombstone",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("note_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="note_tombstones", to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["user", "id"], name="tombstone_user_id_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations
+
+FTS_TABLE = "notes_note_fts"
+PG_INDEX = "note_search_gin_idx"
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "user_id UNINDEXED, title, content, tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, user_id, title, content) "
+            "SELECT id, user_id, title, content FROM notes_note"
+        )
+    elif vendor == "postgresql":
+        from django.contrib.postgres.indexes import GinIndex
+        from django.contrib.postgres.search import SearchVector
+
+        Note = apps.get_model("notes", "Note")
+        schema_editor.add_index(
+            Note,
+            GinIndex(SearchVector("title", "content", config="english"), name=PG_INDEX),
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {PG_INDEX}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notes", "0007_note_tombstone"),
+    ]
+
+    # The search structures depend on the database engine, so they live
+    # outside the model state; apps.notes.search knows how to query them.
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
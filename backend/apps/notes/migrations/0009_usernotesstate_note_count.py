@@ -0,0 +1,37 @@
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+
+
+def backfill_note_counts(apps, schema_editor):
+    Note = apps.get_model("notes", "Note")
+    UserNotesState = apps.get_model("notes", "UserNotesState")
+
+    now = timezone.now()
+    UserNotesState.objects.bulk_create(
+        [
+            UserNotesState(user_id=user_id, note_count=count, updated_at=now)
+            for user_id, count in Note.objects.order_by()
+            .values_list("user_id")
+            .annotate(count=Count("id"))
+        ],
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["note_count"],
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notes", "0008_note_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="usernotesstate",
+            name="note_count",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_note_counts, migrations.RunPython.noop),
+    ]
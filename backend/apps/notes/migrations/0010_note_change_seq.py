@@ -0,0 +1,56 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def stamp_current_versions(apps, schema_editor):
+    # Existing rows take their owner's current version; sync tokens issued
+    # before this migration are answered with 410 and a full resync.
+    Note = apps.get_model("notes", "Note")
+    NoteTombstone = apps.get_model("notes", "NoteTombstone")
+    UserNotesState = apps.get_model("notes", "UserNotesState")
+
+    for model in (Note, NoteTombstone):
+        version = UserNotesState.objects.filter(user_id=OuterRef("user_id")).values("version")
+        model.objects.update(change_seq=Coalesce(Subquery(version), Value(0)))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notes", "0009_usernotesstate_note_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="note",
+            name="change_seq",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="notetombstone",
+            name="change_seq",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="usernotesstate",
+            name="tombstones_pruned_seq",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.RunPython(stamp_current_versions, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="note",
+            index=models.Index(fields=["user", "change_seq", "id"], name="note_user_change_idx"),
+        ),
+        migrations.RemoveIndex(
+            model_name="notetombstone",
+            name="tombstone_user_id_idx",
+        ),
+        migrations.AddIndex(
+            model_name="notetombstone",
+            index=models.Index(fields=["user", "change_seq", "id"], name="tombstone_user_change_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="notetombstone",
+            index=models.Index(fields=["deleted_at"], name="tombstone_deleted_at_idx"),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+FTS_TABLE = "notes_note_fts"
+TOKENIZE = "tokenize='unicode61 remove_diacritics 2'"
+
+
+def _recreate(schema_editor, owner_column: str, owner_value: str):
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({owner_column}, title, content, {TOKENIZE})"
+    )
+    column = owner_column.split()[0]
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, {column}, title, content) "
+        f"SELECT id, {owner_value}, title, content FROM notes_note"
+    )
+
+
+def index_owner_token(apps, schema_editor):
+    # The owner becomes an indexed token ("u42") that searches AND into the
+    # MATCH expression, so FTS5 intersects with the user's rows instead of
+    # collecting matches from every user and filtering afterwards.
+    if schema_editor.connection.vendor == "sqlite":
+        _recreate(schema_editor, "owner", "'u' || user_id")
+
+
+def unindex_owner_token(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        _recreate(schema_editor, "user_id UNINDEXED", "user_id")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notes", "0010_note_change_seq"),
+    ]
+
+    operations = [
+        migrations.RunPython(index_owner_token, unindex_owner_token),
+    ]
@@ -1,5 +1,8 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+
+DEFAULT_NOTE_TITLE = "Note Title"
+DEFAULT_NOTE_CONTENT = "Pour your heart out..."
 
 
 class Category(models.Model):
@@ -28,13 +31,143 @@ class Note(models.Model):
         on_delete=models.PROTECT,
         related_name="notes",
     )
-    title = models.CharField(max_length=255, default="Note Title")
-    content = models.TextField(blank=True, default="Pour your heart out...")
+    title = models.CharField(max_length=255, default=DEFAULT_NOTE_TITLE)
+    content = models.TextField(blank=True, default=DEFAULT_NOTE_CONTENT)
+    # True while title and content are both still the defaults. Stored so
+    # queries can filter on it instead of comparing the content text.
+    is_placeholder = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # UserNotesState.version assigned to the note's last write, in the same
+    # transaction. Unlike updated_at it follows commit order, so delta sync
+    # pages on it.
+    change_seq = models.PositiveBigIntegerField(default=0)
 
     class Meta:
-        ordering = ["-updated_at", "-created_at"]
+        ordering = ["-updated_at", "-id"]
+        indexes = [
+            models.Index(fields=["user", "-updated_at", "-id"], name="note_user_updated_idx"),
+            models.Index(fields=["user", "change_seq", "id"], name="note_user_change_idx"),
+            models.Index(
+                fields=["user", "category", "-updated_at", "-id"],
+                name="note_user_cat_updated_idx",
+            ),
+            models.Index(
+                fields=["user", "category"],
+                condition=models.Q(is_placeholder=False),
+                name="note_visible_idx",
+            ),
+            models.Index(
+                fields=["id"],
+                condition=models.Q(is_placeholder=True),
+                name="note_placeholder_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.user_id}:{self.title}"
+
+    def save(self, *args, **kwargs):
+        self.refresh_placeholder()
+        update_fields = kwargs.get("update_fields")
+        if update_fields:
+            update_fields = set(update_fields)
+            if {"title", "content"} & update_fields:
+                update_fields.add("is_placeholder")
+            # Assigned by the pre_save handler (apps.notes.signals).
+            kwargs["update_fields"] = update_fields | {"change_seq"}
+        # The change number's state-row lock must be held until the note
+        # itself is written, so both happen in one transaction.
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            super().save(*args, **kwargs)
+
+    def refresh_placeholder(self) -> None:
+        self.is_placeholder = (
+            self.title == DEFAULT_NOTE_TITLE and self.content == DEFAULT_NOTE_CONTENT
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what the counters currently account for, so post_save can
+        # apply a delta instead of recounting.
+        instance._counter_state = instance.counter_state()
+        return instance
+
+    def counter_state(self) -> tuple[int, bool] | None:
+        if self.get_deferred_fields() & {"category_id", "is_placeholder"}:
+            return None
+        return self.category_id, not self.is_placeholder
+
+
+class NoteCategoryCounter(models.Model):
+    """
+    Denormalized count of visible notes per category, maintained on every
+    note write so the summary endpoint is a single indexed read.
+    """
+
+    category = models.OneToOneField(
+        "notes.Category",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="counter",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="note_counters",
+    )
+    visible_count = models.IntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.user_id}:{self.category_id}={self.visible_count}"
+
+
+class NoteTombstone(models.Model):
+    """
+    Record of a deleted note, so delta-sync clients can drop it locally.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="note_tombstones",
+    )
+    note_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+    change_seq = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "change_seq", "id"], name="tombstone_user_change_idx"),
+            models.Index(fields=["deleted_at"], name="tombstone_deleted_at_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id}:-{self.note_id}"
+
+
+class UserNotesState(models.Model):
+    """
+    Per-user version counter, bumped on every note or category write. Used
+    to answer conditional GETs without touching the notes themselves.
+    note_count (all notes, placeholders included) answers "does this user
+    have notes" for login and bootstrap. The version doubles as the change
+    number stamped on notes and tombstones for delta sync;
+    tombstones_pruned_seq is the newest change number whose tombstone has
+    been pruned, so older sync tokens can no longer be served.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="notes_state",
+    )
+    version = models.PositiveBigIntegerField(default=0)
+    note_count = models.PositiveBigIntegerField(default=0)
+    tombstones_pruned_seq = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"{self.user_id}@{self.version}"
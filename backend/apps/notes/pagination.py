@@ -0,0 +1,86 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_token(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_token(token: str) -> list:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor("Invalid cursor.") from exc
+    if not isinstance(values, list):
+        raise InvalidCursor("Invalid cursor.")
+    return values
+
+
+def encode_cursor(updated_at: datetime, note_id: int) -> str:
+    return encode_token([updated_at.isoformat(), note_id])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        updated_at, note_id = decode_token(cursor)
+        return datetime.fromisoformat(updated_at), int(note_id)
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursor("Invalid cursor.") from exc
+
+
+def parse_page_size(value: str | None) -> int:
+    if value in (None, ""):
+        return settings.NOTES_PAGE_SIZE
+    try:
+        size = int(value)
+    except ValueError as exc:
+        raise InvalidCursor("Invalid limit.") from exc
+    if size < 1:
+        raise InvalidCursor("Invalid limit.")
+    return min(size, settings.NOTES_MAX_PAGE_SIZE)
+
+
+def _note_key(note):
+    return note.updated_at, note.id
+
+
+def keyset_page(qs, cursor: str | None, limit: int):
+    """
+    Keyset pagination over (updated_at, id), newest first.
+    Each page is a range scan on the (user, -updated_at, -id) index.
+    Returns the query for one page plus a lookahead row; pass the fetched
+    rows to split_page().
+    """
+    qs = qs.order_by("-updated_at", "-id")
+    if cursor:
+        updated_at, note_id = decode_cursor(cursor)
+        qs = qs.filter(
+            Q(updated_at__lt=updated_at) | Q(updated_at=updated_at, id__lt=note_id)
+        )
+    return qs[: limit + 1]
+
+
+def split_page(rows: list, limit: int, key=_note_key):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(*key(rows[-1]))
+    return rows, next_cursor
+
+
+def paginate_notes(qs, cursor: str | None, limit: int, key=_note_key):
+    """
+    `key` extracts (updated_at, id) from a row when qs yields tuples.
+    """
+    return split_page(list(keyset_page(qs, cursor, limit)), limit, key)
@@ -0,0 +1,210 @@
+import html
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from apps.notes.models import Note
+
+FTS_TABLE = "notes_note_fts"
+PG_INDEX = "note_search_gin_idx"
+PG_CONFIG = "english"
+
+# Highlight markers are private-use characters so the surrounding text can be
+# HTML-escaped before they are turned into <mark> tags.
+MARK_START = "\ue000"
+MARK_END = "\ue001"
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def render_highlight(text: str | None) -> str:
+    return html.escape(text or "").replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+
+
+class BaseSearchBackend:
+    def index_notes(self, notes) -> None:
+        pass
+
+    def remove_notes(self, note_ids) -> None:
+        pass
+
+    def rebuild(self) -> int:
+        return 0
+
+    def search(self, user, query: str, limit: int, offset: int) -> list[dict]:
+        raise NotImplementedError
+
+
+class BasicSearchBackend(BaseSearchBackend):
+    """
+    Unindexed fallback for databases without a full-text engine.
+    """
+
+    def search(self, user, query, limit, offset):
+        qs = Note.objects.filter(user=user)
+        for word in WORD_RE.findall(query):
+            qs = qs.filter(Q(title__icontains=word) | Q(content__icontains=word))
+        notes = qs.order_by("-updated_at", "-id").only("id", "title")[offset : offset + limit]
+        return [
+            {"id": note.id, "rank": 0.0, "title": html.escape(note.title), "snippet": ""}
+            for note in notes
+        ]
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """
+    FTS5 virtual table keyed by note id, kept in sync by the Note signals.
+    The owner is stored as an indexed token and ANDed into every MATCH, so a
+    search only walks the user's own rows. bm25() still uses table-wide term
+    statistics (FTS5 keeps no per-owner ones); the owner column has weight 0
+    so its token never affects the score.
+    """
+
+    @staticmethod
+    def owner_token(user_id: int) -> str:
+        return f"u{user_id}"
+
+    @staticmethod
+    def match_expression(query: str) -> str:
+        # Quote every word so user input can never be parsed as FTS syntax,
+        # and prefix-match the terms so search-as-you-type works.
+        return " ".join(f'"{word}"*' for word in WORD_RE.findall(query))
+
+    def index_notes(self, notes) -> None:
+        rows = [
+            (note.id, self.owner_token(note.user_id), note.title, note.content) for note in notes
+        ]
+        if not rows:
+            return
+        self.remove_notes(row[0] for row in rows)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, owner, title, content) "
+                "VALUES (%s, %s, %s, %s)",
+                rows,
+            )
+
+    def remove_notes(self, note_ids) -> None:
+        note_ids = list(note_ids)
+        if not note_ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(note_id,) for note_id in note_ids]
+            )
+
+    def rebuild(self) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, owner, title, content) "
+                "SELECT id, 'u' || user_id, title, content FROM notes_note"
+            )
+            cursor.execute(f"SELECT count(*) FROM {FTS_TABLE}")
+            return cursor.fetchone()[0]
+
+    def search(self, user, query, limit, offset):
+        expression = self.match_expression(query)
+        if not expression:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT rowid,
+                       bm25({FTS_TABLE}, 0.0, 10.0, 1.0) AS rank,
+                       highlight({FTS_TABLE}, 1, %s, %s),
+                       snippet({FTS_TABLE}, 2, %s, %s, '…', 16)
+                FROM {FTS_TABLE}
+                WHERE {FTS_TABLE} MATCH %s
+                ORDER BY rank
+                LIMIT %s OFFSET %s
+                """,
+                [
+                    MARK_START,
+                    MARK_END,
+                    MARK_START,
+                    MARK_END,
+                    f'owner:"{self.owner_token(user.id)}" AND {{title content}}: ({expression})',
+                    limit,
+                    offset,
+                ],
+            )
+            rows = cursor.fetchall()
+        # bm25() is "lower is better"; flip it so callers sort descending.
+        return [
+            {
+                "id": note_id,
+                "rank": -rank,
+                "title": render_highlight(title),
+                "snippet": render_highlight(snippet),
+            }
+            for note_id, rank, title, snippet in rows
+        ]
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    to_tsvector() over title and content, served by an expression GIN index.
+    """
+
+    def vector(self):
+        from django.contrib.postgres.search import SearchVector
+
+        return SearchVector("title", "content", config=PG_CONFIG)
+
+    def index(self):
+        from django.contrib.postgres.indexes import GinIndex
+
+        return GinIndex(self.vector(), name=PG_INDEX)
+
+    def rebuild(self) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(f"REINDEX INDEX {PG_INDEX}")
+        return Note.objects.count()
+
+    def search(self, user, query, limit, offset):
+        from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+
+        search_query = SearchQuery(query, config=PG_CONFIG, search_type="websearch")
+        options = {"config": PG_CONFIG, "start_sel": MARK_START, "stop_sel": MARK_END}
+        rows = (
+            Note.objects.filter(user=user)
+            .annotate(document=self.vector())
+            .filter(document=search_query)
+            .annotate(
+                rank=SearchRank(self.vector(), search_query),
+                title_highlight=SearchHeadline("title", search_query, **options),
+                snippet=SearchHeadline("content", search_query, max_fragments=2, **options),
+            )
+            .order_by("-rank", "-id")
+            .values_list("id", "rank", "title_highlight", "snippet")[offset : offset + limit]
+        )
+        return [
+            {
+                "id": note_id,
+                "rank": rank,
+                "title": render_highlight(title),
+                "snippet": render_highlight(snippet),
+            }
+            for note_id, rank, title, snippet in rows
+        ]
+
+
+def search_notes(user, query: str, limit: int, offset: int) -> list[dict]:
+    hits = get_search_backend().search(user, query, limit, offset)
+    details = {
+        row["id"]: row
+        for row in Note.objects.filter(id__in=[hit["id"] for hit in hits]).values(
+            "id", "category_id", "updated_at"
+        )
+    }
+    return [{**hit, **details[hit["id"]]} for hit in hits if hit["id"] in details]
+
+
+def get_search_backend() -> BaseSearchBackend:
+    if connection.vendor == "sqlite":
+        return SQLiteFTSBackend()
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+    return BasicSearchBackend()
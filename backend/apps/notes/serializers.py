@@ -1,5 +1,7 @@
+from django.db import transaction
 from rest_framework import serializers
 
+from apps.notes.cache import get_category
 from apps.notes.models import Note, Category
 
 
@@ -17,6 +19,27 @@ class NoteSerializer(serializers.ModelSerializer):
         fields = ["id", "category", "title", "content", "created_at", "updated_at"]
 
 
+class NoteListSerializer(serializers.ModelSerializer):
+    """
+    Compact list representation: category by id and a server-truncated
+    content preview instead of the full body. Pass `fields` to keep only
+    a subset.
+    """
+
+    category_id = serializers.IntegerField(read_only=True)
+    content_preview = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Note
+        fields = ["id", "title", "category_id", "content_preview", "created_at", "updated_at"]
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
 class NoteCreateSerializer(serializers.Serializer):
     """
     For 'New Note' button.
@@ -28,16 +51,15 @@ class NoteCreateSerializer(serializers.Serializer):
     title = serializers.CharField(required=False, allow_blank=True)
     content = serializers.CharField(required=False, allow_blank=True)
 
+    @transaction.atomic
     def create(self, validated_data):
         request = self.context["request"]
 
         category_name = validated_data.get("category_name") or "Random Thoughts"
-        category = Category.objects.filter(user=request.user, name=category_name).first()
+        category = get_category(request.user.id, category_name)
 
         if category is None:
-            category = Category.objects.filter(
-                user=request.user, name="Random Thoughts"
-            ).first()
+            category = get_category(request.user.id, "Random Thoughts")
 
         if category is None:
             category = Category.objects.create(
@@ -67,18 +89,27 @@ class NoteUpdateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Invalid category.")
         return value
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         request = self.context["request"]
+        changed = set()
 
         category_name = validated_data.pop("category_name", None)
         if category_name:
-            category = Category.objects.filter(user=request.user, name=category_name).first()
+            category = get_category(request.user.id, category_name)
             if not category:
                 raise serializers.ValidationError({"category_name": "Invalid category"})
-            instance.category = category
+            if category.id != instance.category_id:
+                instance.category = category
+                changed.add("category")
 
         for key, value in validated_data.items():
-            setattr(instance, key, value)
-
-        instance.save()
+            if getattr(instance, key) != value:
+                setattr(instance, key, value)
+                changed.add(key)
+
+        # Autosave often resends what is already stored: skip the write (and
+        # the updated_at bump) entirely, otherwise only touch what changed.
+        if changed:
+            instance.save(update_fields=[*changed, "updated_at"])
         return instance
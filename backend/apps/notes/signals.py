@@ -0,0 +1,90 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from apps.notes import counters
+from apps.notes.cache import invalidate_user_categories
+from apps.notes.models import Category, Note, NoteTombstone
+from apps.notes.search import get_search_backend
+
+
+def _cascaded(origin, model) -> bool:
+    """
+    True when the delete was started by another model (e.g. removing a user),
+    in which case the per-user bookkeeping rows are going away too.
+    """
+    if origin is None:
+        return False
+    if isinstance(origin, QuerySet):
+        return origin.model is not model
+    return not isinstance(origin, model)
+
+
+@receiver(pre_save, sender=Note, dispatch_uid="notes.note_change_seq")
+def note_saving(sender, instance: Note, raw: bool = False, **kwargs):
+    if raw:
+        return
+    # Stamp the change number before the write, so it goes out in the note's
+    # own INSERT/UPDATE (Note.save runs both in one transaction).
+    instance.change_seq = counters.bump_version(
+        instance.user_id, notes_delta=1 if instance._state.adding else 0
+    )
+
+
+@receiver(post_save, sender=Note, dispatch_uid="notes.note_saved_counters")
+def note_saved(sender, instance: Note, created: bool, update_fields=None, **kwargs):
+    if update_fields is None or {"title", "content"} & set(update_fields):
+        get_search_backend().index_notes([instance])
+
+    new_state = instance.counter_state()
+    if created:
+        counters.apply_note_change(instance.user_id, None, new_state)
+    else:
+        old_state = getattr(instance, "_counter_state", None)
+        if old_state is None or new_state is None:
+            counters.rebuild_counters(instance.user_id)
+        else:
+            counters.apply_note_change(instance.user_id, old_state, new_state)
+    instance._counter_state = new_state
+
+
+@receiver(pre_delete, sender=Note, dispatch_uid="notes.note_deleting_state")
+def note_deleting(sender, instance: Note, origin=None, **kwargs):
+    if _cascaded(origin, Note):
+        return
+    # Lock the row and read what is actually being removed: a stale instance,
+    # or a second delete of the same note, must not move the counters again.
+    row = (
+        Note.objects.select_for_update()
+        .filter(id=instance.id)
+        .values_list("category_id", "is_placeholder")
+        .first()
+    )
+    instance._deleted_state = None if row is None else (row[0], not row[1])
+
+
+@receiver(post_delete, sender=Note, dispatch_uid="notes.note_deleted_counters")
+def note_deleted(sender, instance: Note, origin=None, **kwargs):
+    get_search_backend().remove_notes([instance.id])
+    if _cascaded(origin, Note):
+        return
+    old_state = getattr(instance, "_deleted_state", None)
+    if old_state is None:
+        # The row was already gone; its delete did the bookkeeping.
+        return
+    counters.apply_note_change(instance.user_id, old_state, None)
+    with transaction.atomic():
+        change_seq = counters.bump_version(instance.user_id, notes_delta=-1)
+        NoteTombstone.objects.create(
+            user_id=instance.user_id, note_id=instance.id, change_seq=change_seq
+        )
+
+
+@receiver(post_save, sender=Category, dispatch_uid="notes.category_saved_cache")
+@receiver(post_delete, sender=Category, dispatch_uid="notes.category_deleted_cache")
+def category_changed(sender, instance: Category, origin=None, **kwargs):
+    invalidate_user_categories(instance.user_id)
+    if _cascaded(origin, Category):
+        return
+    counters.bump_version(instance.user_id)
@@ -0,0 +1,86 @@
+from django.db.models import Max, Q
+
+from apps.notes.models import Note, NoteTombstone, UserNotesState
+from apps.notes.pagination import InvalidCursor, decode_token, encode_token
+
+
+class SyncTokenExpired(Exception):
+    """
+    The token predates tombstones that have since been pruned (or the change
+    numbers themselves); the client must drop its copy and sync from scratch.
+    """
+
+
+def _after(cursor: tuple[int, int]) -> Q:
+    change_seq, row_id = cursor
+    return Q(change_seq__gt=change_seq) | Q(change_seq=change_seq, id__gt=row_id)
+
+
+def _parse_since(token: str | None, user) -> tuple[tuple[int, int], tuple[int, int]]:
+    version, pruned_seq = (
+        UserNotesState.objects.filter(user=user)
+        .values_list("version", "tombstones_pruned_seq")
+        .first()
+        or (0, 0)
+    )
+    if not token:
+        # A fresh client gets every note, and no deletions it never saw.
+        last_tombstone = (
+            NoteTombstone.objects.filter(user=user, change_seq=version).aggregate(
+                last=Max("id")
+            )["last"]
+            or 0
+        )
+        return (0, 0), (version, last_tombstone)
+    try:
+        values = decode_token(token)
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursor("Invalid token.") from exc
+    if len(values) == 3:
+        # Issued before change numbers existed (paged on updated_at).
+        raise SyncTokenExpired
+    try:
+        note_seq, note_id, tombstone_seq, tombstone_id = (int(value) for value in values)
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursor("Invalid token.") from exc
+    if tombstone_seq < pruned_seq:
+        raise SyncTokenExpired
+    return (note_seq, note_id), (tombstone_seq, tombstone_id)
+
+
+def changes_since(user, token: str | None, limit: int) -> dict:
+    """
+    Notes created or updated and notes deleted after `token`, in change
+    number order, plus the token to resume from. Change numbers are assigned
+    under the per-user state row lock, so a write can never commit behind a
+    cursor that was already handed out. Both reads are index range scans.
+    Raises SyncTokenExpired when deletions the token still needs were pruned.
+    """
+    note_cursor, tombstone_cursor = _parse_since(token, user)
+
+    upserts = list(
+        Note.objects.filter(_after(note_cursor), user=user)
+        .select_related("category")
+        .order_by("change_seq", "id")[: limit + 1]
+    )
+    tombstones = list(
+        NoteTombstone.objects.filter(_after(tombstone_cursor), user=user)
+        .order_by("change_seq", "id")
+        .values_list("change_seq", "id", "note_id")[: limit + 1]
+    )
+
+    has_more = len(upserts) > limit or len(tombstones) > limit
+    upserts = upserts[:limit]
+    tombstones = tombstones[:limit]
+
+    if upserts:
+        note_cursor = (upserts[-1].change_seq, upserts[-1].id)
+    if tombstones:
+        tombstone_cursor = tombstones[-1][:2]
+
+    return {
+        "upserts": upserts,
+        "deleted": [note_id for _, _, note_id in tombstones],
+        "token": encode_token([*note_cursor, *tombstone_cursor]),
+        "has_more": has_more,
+    }
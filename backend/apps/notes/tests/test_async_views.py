@@ -0,0 +1,131 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import include, path
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.notes import async_views
+from apps.notes.models import Category, Note
+from apps.users.models import User
+from apps.users.serializers import DEFAULT_CATEGORIES
+
+# Mount the async handlers the way NOTES_ASYNC_VIEWS does, ahead of the sync URLs.
+urlpatterns = [
+    path("api/notes", async_views.notes_list),
+    path("api/notes/summary", async_views.notes_summary),
+    path("api/notes/<int:note_id>", async_views.note_detail),
+    path("api/", include("apps.users.urls")),
+    path("api/", include("apps.notes.urls")),
+]
+
+pytestmark = [pytest.mark.django_db, pytest.mark.urls(__name__)]
+
+
+def create_user(email: str):
+    user = User.objects.create_user(email=email, password="StrongPass123")
+    for name, color_hex in DEFAULT_CATEGORIES:
+        Category.objects.create(user=user, name=name, color_hex=color_hex)
+    return user
+
+
+def auth_header(user: User) -> str:
+    return f"Bearer {RefreshToken.for_user(user).access_token}"
+
+
+def async_get(path: str, **headers):
+    return async_to_sync(AsyncClient().get)(path, headers=headers)
+
+
+def sync_get(path: str, authorization: str):
+    # The same request through the DRF views, for a byte-for-byte comparison.
+    from django.test import override_settings
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=authorization)
+    with override_settings(ROOT_URLCONF="config.urls"):
+        return client.get(path)
+
+
+def test_async_reads_match_the_sync_views():
+    user = create_user("async@example.com")
+    category = Category.objects.get(user=user, name="School")
+    for index in range(3):
+        Note.objects.create(user=user, category=category, title=f"Note {index}", content="Body")
+    note = Note.objects.filter(user=user).first()
+    authorization = auth_header(user)
+
+    for path in (
+        "/api/notes",
+        "/api/notes?limit=2",
+        "/api/notes?category=School",
+        "/api/notes/summary",
+        f"/api/notes/{note.id}",
+    ):
+        response = async_get(path, authorization=authorization)
+        expected_response = sync_get(path, authorization)
+        assert response.status_code == 200, path
+        assert response.content == expected_response.content, path
+        assert response["ETag"] == expected_response["ETag"], path
+
+
+def test_async_views_answer_conditional_gets():
+    user = create_user("etag@example.com")
+    note = Note.objects.create(user=user, category=user.categories.first(), title="T", content="C")
+    authorization = auth_header(user)
+
+    for path in ("/api/notes", "/api/notes/summary", f"/api/notes/{note.id}"):
+        first = async_get(path, authorization=authorization)
+        assert "Authorization" in first["Vary"]
+        assert "private" in first["Cache-Control"]
+        second = async_get(path, authorization=authorization, **{"If-None-Match": first["ETag"]})
+        assert second.status_code == 304, path
+        assert second.content == b""
+
+
+def test_async_views_require_authentication():
+    response = async_get("/api/notes/summary")
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Authentication credentials were not provided."}
+    assert response["WWW-Authenticate"] == 'Bearer realm="api"'
+
+    invalid = async_get("/api/notes", authorization="Bearer not-a-token")
+    assert invalid.status_code == 401
+    assert invalid.json()["code"] == "token_not_valid"
+
+
+def test_async_detail_is_scoped_to_the_user():
+    owner = create_user("owner@example.com")
+    other = create_user("other@example.com")
+    note = Note.objects.create(user=owner, category=owner.categories.first(), title="T", content="C")
+
+    response = async_get(f"/api/notes/{note.id}", authorization=auth_header(other))
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Not found."}
+
+
+def test_writes_and_compact_lists_fall_through_to_the_sync_views():
+    user = create_user("writes@example.com")
+    client = AsyncClient()
+    headers = {"authorization": auth_header(user)}
+
+    created = async_to_sync(client.post)(
+        "/api/notes", {"title": "Hello", "content": "World"}, content_type="application/json", headers=headers
+    )
+    assert created.status_code == 201
+    note_id = created.json()["id"]
+
+    patched = async_to_sync(client.patch)(
+        f"/api/notes/{note_id}", {"title": "Changed"}, content_type="application/json", headers=headers
+    )
+    assert patched.status_code == 200
+    assert patched.json()["title"] == "Changed"
+
+    compact = async_to_sync(client.get)("/api/notes?view=compact", headers=headers)
+    assert compact.status_code == 200
+    assert set(compact.json()[0]) == {
+        "id", "title", "category_id", "content_preview", "created_at", "updated_at"
+    }
+
+    deleted = async_to_sync(client.delete)(f"/api/notes/{note_id}", headers=headers)
+    assert deleted.status_code == 204
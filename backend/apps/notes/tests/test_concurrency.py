@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+from django.db import connection, connections
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.notes.models import Category, Note, NoteCategoryCounter, UserNotesState
+from apps.users.models import User
+
+WRITERS = 8
+PATCHES_PER_WRITER = 10
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_autosaves_do_not_hit_database_locks():
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            assert cursor.fetchone()[0] == "wal"
+
+    user = User.objects.create_user(email="writer@example.com", password="StrongPass123")
+    category = Category.objects.create(user=user, name="School", color_hex="#FCDC94")
+    notes = [
+        Note.objects.create(user=user, category=category, title=f"Note {i}", content="Body")
+        for i in range(2)
+    ]
+    token = str(RefreshToken.for_user(user).access_token)
+
+    statuses = []
+    errors = []
+    start = threading.Barrier(WRITERS)
+
+    def writer(index):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        try:
+            start.wait()
+            for step in range(PATCHES_PER_WRITER):
+                note = notes[(index + step) % len(notes)]
+                response = client.patch(
+                    f"/api/notes/{note.id}",
+                    {"content": f"writer {index} step {step}"},
+                    format="json",
+                )
+                statuses.append(response.status_code)
+        except Exception as exc:  # noqa: BLE001 - reported below
+            errors.append(exc)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=writer, args=(index,)) for index in range(WRITERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert statuses == [200] * (WRITERS * PATCHES_PER_WRITER)
+    assert NoteCategoryCounter.objects.get(category=category).visible_count == 2
+    assert UserNotesState.objects.get(user=user).version >= WRITERS * PATCHES_PER_WRITER
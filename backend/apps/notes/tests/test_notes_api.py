@@ -1,13 +1,21 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
 import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from apps.notes.models import Category, Note
+from apps.notes.models import Category, Note, NoteCategoryCounter, NoteTombstone, UserNotesState
+from apps.notes.pagination import encode_token
 from apps.users.models import User
 from apps.users.serializers import DEFAULT_CATEGORIES
 
-pytestmark = pytest.mark.django_db
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("query_baseline")]
 
 
 def create_user(email: str, password: str = "StrongPass123"):
@@ -101,8 +109,8 @@ def test_list_filtering_by_category():
     client = auth_client(user)
     response = client.get("/api/notes?category=School")
     assert response.status_code == 200
-    assert len(response.data) == 1
-    assert response.data[0]["category"]["name"] == "School"
+    assert len(response.json()) == 1
+    assert response.json()[0]["category"]["name"] == "School"
 
 
 def test_categories_list():
@@ -117,7 +125,7 @@ def test_categories_list():
     assert names == ["Personal", "Random Thoughts", "School"]
 
 
-def test_patch_updates_note_and_timestamp():
+def test_patch_updates_note_and_timestamp(query_baseline):
     user = create_user("patch@example.com")
     seed_categories(user)
     random_category = Category.objects.get(user=user, name="Random Thoughts")
@@ -132,11 +140,12 @@ def test_patch_updates_note_and_timestamp():
     before = note.updated_at
 
     client = auth_client(user)
-    response = client.patch(
-        f"/api/notes/{note.id}",
-        {"title": "New", "content": "New", "category_name": "School"},
-        format="json",
-    )
+    with query_baseline.scenario("category move"):
+        response = client.patch(
+            f"/api/notes/{note.id}",
+            {"title": "New", "content": "New", "category_name": "School"},
+            format="json",
+        )
     assert response.status_code == 200
     assert response.data["title"] == "New"
     assert response.data["content"] == "New"
@@ -206,3 +215,558 @@ def test_summary_counts_note_after_editing_defaults():
     assert summary.status_code == 200
     assert summary.data["has_notes"] is True
     assert summary.data["total_notes"] == 1
+
+
+def test_list_cursor_pagination_walks_all_notes():
+    user = create_user("pages@example.com")
+    seed_categories(user)
+    random_category = Category.objects.get(user=user, name="Random Thoughts")
+    created = [
+        Note.objects.create(user=user, category=random_category, title=f"N{i}", content="x")
+        for i in range(5)
+    ]
+    # Force a tie on updated_at so the id tie-breaker is exercised.
+    tied = timezone.now()
+    Note.objects.filter(id__in=[n.id for n in created]).update(updated_at=tied)
+
+    client = auth_client(user)
+    seen = []
+    cursor = None
+    while True:
+        url = "/api/notes?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(url)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["results"]) <= 2
+        seen.extend(item["id"] for item in page["results"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == sorted((n.id for n in created), reverse=True)
+
+
+def test_list_pagination_with_category_filter():
+    user = create_user("pagecat@example.com")
+    seed_categories(user)
+    random_category = Category.objects.get(user=user, name="Random Thoughts")
+    school_category = Category.objects.get(user=user, name="School")
+    for i in range(3):
+        Note.objects.create(user=user, category=school_category, title=f"S{i}", content="x")
+    Note.objects.create(user=user, category=random_category, title="R", content="x")
+
+    client = auth_client(user)
+    response = client.get("/api/notes?category=School&limit=10")
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == 3
+    assert response.json()["next_cursor"] is None
+
+
+def test_list_pagination_rejects_bad_cursor():
+    user = create_user("badcursor@example.com")
+    seed_categories(user)
+    client = auth_client(user)
+
+    assert client.get("/api/notes?cursor=not-a-cursor").status_code == 400
+    assert client.get("/api/notes?limit=zero").status_code == 400
+
+
+def test_summary_counters_follow_category_moves_and_deletes():
+    user = create_user("counters@example.com")
+    seed_categories(user)
+    client = auth_client(user)
+
+    note_id = client.post("/api/notes", {"title": "Real"}, format="json").data["id"]
+    client.patch(f"/api/notes/{note_id}", {"category_name": "School"}, format="json")
+
+    summary = client.get("/api/notes/summary")
+    category_counts = {item["name"]: item["count"] for item in summary.data["categories"]}
+    assert category_counts == {"Random Thoughts": 0, "School": 1, "Personal": 0}
+    assert summary.data["total_notes"] == 1
+
+    client.delete(f"/api/notes/{note_id}")
+    summary = client.get("/api/notes/summary")
+    assert summary.data["total_notes"] == 0
+    assert summary.data["has_notes"] is False
+
+
+def test_deleting_a_note_twice_moves_the_counters_once():
+    user = create_user("twice@example.com")
+    seed_categories(user)
+    random_category = Category.objects.get(user=user, name="Random Thoughts")
+    kept = Note.objects.create(user=user, category=random_category, title="Kept", content="K")
+    note = Note.objects.create(user=user, category=random_category, title="Gone", content="G")
+    stale = Note.objects.get(id=note.id)
+    client = auth_client(user)
+
+    assert client.delete(f"/api/notes/{note.id}").status_code == 204
+    assert client.delete(f"/api/notes/{note.id}").status_code == 404
+    stale.delete()
+
+    assert NoteCategoryCounter.objects.get(category=random_category).visible_count == 1
+    assert UserNotesState.objects.get(user=user).note_count == 1
+    assert NoteTombstone.objects.filter(user=user, note_id=note.id).count() == 1
+    assert Note.objects.filter(user=user).get() == kept
+
+
+def test_rebuild_note_counters_command_repairs_drift():
+    user = create_user("drift@example.com")
+    seed_categories(user)
+    random_category = Category.objects.get(user=user, name="Random Thoughts")
+    Note.objects.create(user=user, category=random_category, title="A", content="A")
+    NoteCategoryCounter.objects.filter(category=random_category).update(visible_count=7)
+    UserNotesState.objects.filter(user=user).update(note_count=3)
+
+    out = StringIO()
+    with pytest.raises(CommandError):
+        call_command("rebuild_note_counters", "--verify", stdout=out)
+    assert f"user {user.id}: stored=3 actual=1" in out.getvalue()
+
+    call_command("rebuild_note_counters", stdout=StringIO())
+    call_command("rebuild_note_counters", "--verify", stdout=StringIO())
+    assert NoteCategoryCounter.objects.get(category=random_category).visible_count == 1
+    assert UserNotesState.objects.get(user=user).note_count == 1
+
+
+def test_is_placeholder_tracks_title_and_content():
+    user = create_user("placeholder@example.com")
+    seed_categories(user)
+    client = auth_client(user)
+
+    note_id = client.post("/api/notes", {}, format="json").data["id"]
+    assert Note.objects.get(id=note_id).is_placeholder is True
+
+    client.patch(f"/api/notes/{note_id}", {"content": "Something"}, format="json")
+    assert Note.objects.get(id=note_id).is_placeholder is False
+
+    client.patch(f"/api/notes/{note_id}", {"content": "Pour your heart out..."}, format="json")
+    assert Note.objects.get(id=note_id).is_placeholder is True
+
+
+def test_cleanup_empty_notes_only_removes_placeholders():
+    user = create_user("cleanup@example.com")
+    seed_categories(user)
+    random_category = Category.objects.get(user=user, name="Random Thoughts")
+    Note.objects.create(user=user, category=random_category)
+    kept = Note.objects.create(user=user, category=random_category, title="Keep me")
+
+    call_command("cleanup_empty_notes", stdout=StringIO())
+    assert list(Note.objects.filter(user=user).values_list("id", flat=True)) == [kept.id]
+    assert UserNotesState.objects.get(user=user).note_count == 1
+
+
+def test_cleanup_empty_notes_batches_and_dry_run():
+    user = create_user("cleanupbatch@example.com")
+    seed_categories(user)
+    random_category = Category.objects.get(user=user, name="Random Thoughts")
+    for _ in range(5):
+        Note.objects.create(user=user, category=random_category)
+    fresh = Note.objects.create(user=user, category=random_category)
+    Note.objects.exclude(id=fresh.id).update(updated_at=timezone.now() - timedelta(days=2))
+
+    out = StringIO()
+    call_command("cleanup_empty_notes", "--dry-run", "--batch-size=2", stdout=out)
+    assert "Would delete 6 empty notes in 3 batches" in out.getvalue()
+    assert Note.objects.filter(user=user).count() == 6
+
+    out = StringIO()
+    call_command("cleanup_empty_notes", "--batch-size=2", "--older-than=1d", stdout=out)
+    assert "Deleted 5 empty notes in 3 batches" in out.getvalue()
+    assert list(Note.objects.filter(user=user).values_list("id", flat=True)) == [fresh.id]
+
+
+def test_category_resolution_is_cached_and_invalidated():
+    user = create_user("catcache@example.com")
+    seed_categories(user)
+    client = auth_client(user)
+
+    assert len(client.get("/api/categories").data) == 3
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.post("/api/notes", {"category_name": "School"}, format="json")
+    assert response.status_code == 201
+    assert response.data["category"]["name"] == "School"
+    assert not [q for q in ctx.captured_queries if 'FROM "notes_category"' in q["sql"]]
+
+    Category.objects.create(user=user, name="Work", color_hex="#000000")
+    assert len(client.get("/api/categories").data) == 4
+
+
+def test_conditional_get_returns_304_until_notes_change():
+    user = create_user("etag@example.com")
+    seed_categories(user)
+    random_category = Category.objects.get(user=user, name="Random Thoughts")
+    note = Note.objects.create(user=user, category=random_category, title="T", content="C")
+    client = auth_client(user)
+
+    for url in ("/api/notes", "/api/notes/summary", "/api/categories", f"/api/notes/{note.id}"):
+        first = client.get(url)
+        assert first.status_code == 200
+        etag = first["ETag"]
+        assert first.has_header("Last-Modified")
+
+        cached = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert cached.status_code == 304
+
+    etag = client.get("/api/notes")["ETag"]
+    client.patch(f"/api/notes/{note.id}", {"title": "Changed"}, format="json")
+    assert client.get("/api/notes", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_changes_endpoint_returns_upserts_and_deletions_since_token():
+    user = create_user("sync@example.com")
+    seed_categories(user)
+    random_category = Category.objects.get(user=user, name="Random Thoughts")
+    kept = Note.objects.create(user=user, category=random_category, title="Keep", content="x")
+    doomed = Note.objects.create(user=user, category=random_category, title="Drop", content="x")
+    client = auth_client(user)
+
+    initial = client.get("/api/notes/changes")
+    assert initial.status_code == 200
+    assert [n["id"] for n in initial.data["upserts"]] == [kept.id, doomed.id]
+    assert initial.data["deleted"] == []
+    token = initial.data["token"]
+
+    empty = client.get(f"/api/notes/changes?since={token}")
+    assert empty.data["upserts"] == []
+    assert empty.data["deleted"] == []
+
+    client.patch(f"/api/notes/{kept.id}", {"title": "Kept"}, format="json")
+    client.delete(f"/api/notes/{doomed.id}")
+
+    delta = client.get(f"/api/notes/changes?since={token}")
+    assert [n["title"] for n in delta.data["upserts"]] == ["Kept"]
+    assert delta.data["deleted"] == [doomed.id]
+    assert delta.data["has_more"] is False
+
+    assert client.get("/api/notes/changes?since=garbage").status_code == 400
+
+
+def test_changes_follow_commit_order_not_updated_at():
+    user = create_user("late@example.com")
+    seed_categories(user)
+    category = Category.objects.get(user=user, name="School")
+    early = Note.objects.create(user=user, category=category, title="Early", content="x")
+    client = auth_client(user)
+    Note.objects.create(user=user, category=category, title="Seen", content="x")
+    token = client.get("/api/notes/changes").data["token"]
+
+    # A write whose auto_now timestamp predates what the client already saw,
+    # as when its transaction commits late.
+    client.patch(f"/api/notes/{early.id}", {"title": "Late"}, format="json")
+    Note.objects.filter(id=early.id).update(updated_at=timezone.now() - timedelta(days=1))
+
+    early.refresh_from_db()
+    assert early.change_seq == UserNotesState.objects.get(user=user).version
+    delta = client.get(f"/api/notes/changes?since={token}")
+    assert [n["title"] for n in delta.data["upserts"]] == ["Late"]
+
+
+def test_pruned_tombstones_expire_older_sync_tokens():
+    user = create_user("prune@example.com")
+    seed_categories(user)
+    category = Category.objects.get(user=user, name="School")
+    doomed = Note.objects.create(user=user, category=category, title="Drop", content="x")
+    client = auth_client(user)
+    token = client.get("/api/notes/changes").data["token"]
+    client.delete(f"/api/notes/{doomed.id}")
+
+    long_ago = timezone.now() - timedelta(days=40)
+    NoteTombstone.objects.filter(user=user).update(deleted_at=long_ago)
+    out = StringIO()
+    call_command("prune_note_tombstones", "--older-than", "30d", stdout=out)
+    assert "Pruned 1 tombstones." in out.getvalue()
+    assert not NoteTombstone.objects.filter(user=user).exists()
+
+    assert client.get(f"/api/notes/changes?since={token}").status_code == 410
+    fresh = client.get("/api/notes/changes")
+    assert fresh.status_code == 200
+    assert client.get(f"/api/notes/changes?since={fresh.data['token']}").status_code == 200
+
+    legacy = encode_token(["2024-01-01T00:00:00+00:00", 1, 0])
+    assert client.get(f"/api/notes/changes?since={legacy}").status_code == 410
+
+
+def test_compact_list_view_sends_preview_instead_of_content():
+    user = create_user("compact@example.com")
+    seed_categories(user)
+    school_category = Category.objects.get(user=user, name="School")
+    Note.objects.create(user=user, category=school_category, title="Long", content="x" * 5000)
+    client = auth_client(user)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/api/notes?view=compact")
+    assert response.status_code == 200
+    item = response.data[0]
+    assert set(item) == {"id", "title", "category_id", "content_preview", "created_at", "updated_at"}
+    assert item["category_id"] == school_category.id
+    assert len(item["content_preview"]) == 200
+    notes_query = next(q["sql"] for q in ctx.captured_queries if 'FROM "notes_note"' in q["sql"])
+    # The only reference to content is inside SUBSTR().
+    assert notes_query.count('"notes_note"."content"') == 1
+    assert 'SUBSTR("notes_note"."content"' in notes_query
+
+    response = client.get("/api/notes?fields=id,title&limit=5")
+    assert set(response.data["results"][0]) == {"id", "title"}
+
+    assert client.get("/api/notes?fields=id,secret").status_code == 400
+
+
+@pytest.mark.parametrize("query", ["", "?limit=2", "?category=School&limit=50"])
+def test_fast_list_path_matches_drf_serializer_bytes(settings, query):
+    user = create_user("parity@example.com")
+    seed_categories(user)
+    random_category = Category.objects.get(user=user, name="Random Thoughts")
+    school_category = Category.objects.get(user=user, name="School")
+    Note.objects.create(user=user, category=random_category, title="Plain", content="Text")
+    Note.objects.create(
+        user=user,
+        category=school_category,
+        title='Quotes "and" \\ slashes',
+        content="Unicode caf\u00e9 \u2603 \u2028 line\nbreak\ttab \u0001",
+    )
+    Note.objects.create(user=user, category=school_category)
+    client = auth_client(user)
+
+    settings.NOTES_FAST_SERIALIZATION = True
+    fast = client.get(f"/api/notes{query}")
+    settings.NOTES_FAST_SERIALIZATION = False
+    slow = client.get(f"/api/notes{query}")
+
+    assert fast.status_code == slow.status_code == 200
+    assert fast["Content-Type"] == slow["Content-Type"]
+    assert fast.content == slow.content
+
+
+def test_patch_without_changes_skips_the_write(query_baseline):
+    user = create_user("noop@example.com")
+    seed_categories(user)
+    random_category = Category.objects.get(user=user, name="Random Thoughts")
+    note = Note.objects.create(user=user, category=random_category, title="Same", content="Same")
+    before = note.updated_at
+    client = auth_client(user)
+    client.get(f"/api/notes/{note.id}")  # the editor has the note open: caches are warm
+
+    with query_baseline.scenario("no-op autosave"), CaptureQueriesContext(connection) as ctx:
+        response = client.patch(
+            f"/api/notes/{note.id}",
+            {"title": "Same", "content": "Same", "category_name": "Random Thoughts"},
+            format="json",
+        )
+    assert response.status_code == 200
+    assert not [q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+    note.refresh_from_db()
+    assert note.updated_at == before
+
+    with query_baseline.scenario("title edit"), CaptureQueriesContext(connection) as ctx:
+        client.patch(f"/api/notes/{note.id}", {"title": "Other"}, format="json")
+    note_update = next(q["sql"] for q in ctx.captured_queries if 'UPDATE "notes_note"' in q["sql"])
+    assert '"content"' not in note_update
+
+
+def test_patch_with_stale_if_match_is_rejected():
+    user = create_user("ifmatch@example.com")
+    seed_categories(user)
+    random_category = Category.objects.get(user=user, name="Random Thoughts")
+    note = Note.objects.create(user=user, category=random_category, title="V1", content="x")
+    client = auth_client(user)
+
+    etag = client.get(f"/api/notes/{note.id}")["ETag"]
+    first = client.patch(
+        f"/api/notes/{note.id}", {"title": "V2"}, format="json", HTTP_IF_MATCH=etag
+    )
+    assert first.status_code == 200
+    assert first["ETag"] != etag
+
+    stale = client.patch(
+        f"/api/notes/{note.id}", {"title": "V3"}, format="json", HTTP_IF_MATCH=etag
+    )
+    assert stale.status_code == 412
+    note.refresh_from_db()
+    assert note.title == "V2"
+
+    fresh = client.patch(
+        f"/api/notes/{note.id}", {"title": "V3"}, format="json", HTTP_IF_MATCH=first["ETag"]
+    )
+    assert fresh.status_code == 200
+
+
+def test_batch_applies_mixed_operations_in_one_request():
+    user = create_user("batch@example.com")
+    seed_categories(user)
+    random_category = Category.objects.get(user=user, name="Random Thoughts")
+    editable = Note.objects.create(user=user, category=random_category, title="Edit", content="x")
+    doomed = Note.objects.create(user=user, category=random_category, title="Drop", content="x")
+    client = auth_client(user)
+
+    response = client.post(
+        "/api/notes/batch",
+        {
+            "operations": [
+                {"op": "create", "title": "Imported", "category_name": "School"},
+                {"op": "create"},
+                {"op": "update", "id": editable.id, "category_name": "Personal"},
+                {"op": "delete", "id": doomed.id},
+                {"op": "delete", "id": 999999},
+                {"op": "update", "id": editable.id, "category_name": "Nope"},
+                {"op": "rename"},
+            ]
+        },
+        format="json",
+    )
+    assert response.status_code == 200
+    results = response.data["results"]
+    assert [r["status"] for r in results] == [201, 201, 200, 204, 404, 400, 400]
+    assert results[0]["note"]["category"]["name"] == "School"
+    assert results[0]["note"]["created_at"]
+    assert results[1]["note"]["title"] == "Note Title"
+    assert results[2]["note"]["category"]["name"] == "Personal"
+
+    assert not Note.objects.filter(id=doomed.id).exists()
+    assert Note.objects.get(id=editable.id).category.name == "Personal"
+    assert Note.objects.get(id=results[1]["id"]).is_placeholder is True
+
+    summary = client.get("/api/notes/summary")
+    category_counts = {item["name"]: item["count"] for item in summary.data["categories"]}
+    assert category_counts == {"Random Thoughts": 0, "School": 1, "Personal": 1}
+    call_command("rebuild_note_counters", "--verify", stdout=StringIO())
+
+    changes = client.get("/api/notes/changes").data
+    assert doomed.id not in [n["id"] for n in changes["upserts"]]
+
+
+def test_batch_update_rejects_a_category_the_user_does_not_have():
+    user = create_user("batchcat@example.com")
+    seed_categories(user)
+    random_category = Category.objects.get(user=user, name="Random Thoughts")
+    Category.objects.filter(user=user, name="School").delete()
+    note = Note.objects.create(user=user, category=random_category, title="Keep", content="x")
+    client = auth_client(user)
+
+    response = client.post(
+        "/api/notes/batch",
+        {"operations": [{"op": "update", "id": note.id, "title": "New", "category_name": "School"}]},
+        format="json",
+    )
+    detail = client.patch(f"/api/notes/{note.id}", {"category_name": "School"}, format="json")
+
+    [result] = response.data["results"]
+    assert result["status"] == detail.status_code == 400
+    assert result["errors"] == {"category_name": ["Invalid category"]}
+    assert detail.data == {"category_name": "Invalid category"}
+    note.refresh_from_db()
+    assert (note.title, note.category_id) == ("Keep", random_category.id)
+
+
+def test_batch_rejects_oversized_requests(settings):
+    settings.NOTES_BATCH_MAX_SIZE = 2
+    user = create_user("batchmax@example.com")
+    seed_categories(user)
+    client = auth_client(user)
+
+    response = client.post(
+        "/api/notes/batch", {"operations": [{"op": "create"}] * 3}, format="json"
+    )
+    assert response.status_code == 400
+    assert Note.objects.filter(user=user).count() == 0
+
+
+def test_search_ranks_highlights_and_follows_edits():
+    user = create_user("search@example.com")
+    seed_categories(user)
+    other = create_user("search-other@example.com")
+    seed_categories(other)
+    random_category = Category.objects.get(user=user, name="Random Thoughts")
+    title_hit = Note.objects.create(
+        user=user, category=random_category, title="Garden plans", content="Tomatoes"
+    )
+    body_hit = Note.objects.create(
+        user=user, category=random_category, title="Misc", content="Water the garden <b>now</b>"
+    )
+    Note.objects.create(
+        user=other,
+        category=Category.objects.get(user=other, name="Random Thoughts"),
+        title="Garden",
+        content="Not yours",
+    )
+    client = auth_client(user)
+
+    response = client.get("/api/notes/search?q=gard")
+    assert response.status_code == 200
+    results = response.data["results"]
+    assert [r["id"] for r in results] == [title_hit.id, body_hit.id]
+    assert results[0]["title"] == "<mark>Garden</mark> plans"
+    assert "&lt;b&gt;now&lt;/b&gt;" in results[1]["snippet"]
+    assert results[1]["category_id"] == random_category.id
+
+    client.patch(f"/api/notes/{title_hit.id}", {"title": "Kitchen"}, format="json")
+    client.delete(f"/api/notes/{body_hit.id}")
+    assert client.get('/api/notes/search?q=garden"').data["results"] == []
+
+    call_command("rebuild_search_index", stdout=StringIO())
+    assert [r["id"] for r in client.get("/api/notes/search?q=kitchen").data["results"]] == [
+        title_hit.id
+    ]
+    assert client.get("/api/notes/search?q=").status_code == 400
+    # The owner token is only a filter, never something a query can match.
+    assert client.get(f"/api/notes/search?q=u{user.id}").data["results"] == []
+    assert client.get("/api/notes/search?q=u").data["results"] == []
+
+
+def test_export_streams_ndjson_and_import_round_trips(settings):
+    settings.NOTES_IMPORT_BATCH_SIZE = 2
+    source = create_user("export@example.com")
+    seed_categories(source)
+    school_category = Category.objects.get(user=source, name="School")
+    Category.objects.create(user=source, name="Recipes", color_hex="#123456")
+    for i in range(3):
+        Note.objects.create(user=source, category=school_category, title=f"N{i}", content="body")
+
+    response = auth_client(source).get("/api/notes/export")
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "application/x-ndjson"
+    body = b"".join(response.streaming_content)
+    records = [json.loads(line) for line in body.splitlines()]
+    assert [r["type"] for r in records] == ["category"] * 4 + ["note"] * 3
+    assert records[-1]["category"] == "School"
+
+    target = create_user("import@example.com")
+    seed_categories(target)
+    client = auth_client(target)
+    payload = body + b"not json\n" + b'{"type": "note", "title": "Extra"}\n'
+    response = client.post("/api/notes/import", payload, content_type="application/x-ndjson")
+    assert response.status_code == 201
+    assert response.data["notes_created"] == 4
+    assert response.data["categories_created"] == 1
+    assert response.data["errors"] == [{"line": 8, "detail": "Invalid JSON."}]
+
+    assert Category.objects.get(user=target, name="Recipes").color_hex == "#123456"
+    assert Note.objects.filter(user=target, category__name="School").count() == 3
+    summary = client.get("/api/notes/summary")
+    assert summary.data["total_notes"] == 4
+    call_command("rebuild_note_counters", "--verify", stdout=StringIO())
+
+
+def test_import_reports_bad_categories_instead_of_failing():
+    user = create_user("badimport@example.com")
+    seed_categories(user)
+    client = auth_client(user)
+    long_name = "L" * 80
+    lines = [
+        {"type": "category", "name": "Numbers", "color_hex": 123456},
+        {"type": "category", "name": "Lists", "color_hex": ["#000000"]},
+        {"type": "category", "name": "Short", "color_hex": "#12345"},
+        {"type": "category", "name": long_name + "-one", "color_hex": "#ABCDEF"},
+        {"type": "note", "category": long_name + "-two", "title": "Long"},
+    ]
+    payload = b"".join(json.dumps(line).encode() + b"\n" for line in lines)
+
+    response = client.post("/api/notes/import", payload, content_type="application/x-ndjson")
+    assert response.status_code == 201
+    assert [error["line"] for error in response.data["errors"]] == [1, 2, 3]
+    assert response.data["categories_created"] == 1
+    assert response.data["notes_created"] == 1
+    category = Category.objects.get(user=user, name=long_name)
+    assert category.color_hex == "#ABCDEF"
+    assert Note.objects.get(user=user, title="Long").category == category
@@ -0,0 +1,159 @@
+import json
+import re
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.notes import counters
+from apps.notes.fast_serializers import dumps, format_datetime
+from apps.notes.models import DEFAULT_NOTE_CONTENT, DEFAULT_NOTE_TITLE, Category, Note
+from apps.notes.search import get_search_backend
+from apps.notes.serializers import NoteCreateSerializer
+
+MAX_REPORTED_ERRORS = 100
+DEFAULT_CATEGORY_COLOR = "#EF9C66"
+COLOR_HEX_RE = re.compile(r"#[0-9A-Fa-f]{6}")
+CATEGORY_NAME_LENGTH = Category._meta.get_field("name").max_length
+
+
+def export_lines(user):
+    """
+    Yield the user's library as NDJSON: categories first, then notes in id
+    order, read from a server-side cursor so memory stays flat.
+    """
+    categories = {}
+    for category_id, name, color_hex in (
+        Category.objects.filter(user=user).order_by("id").values_list("id", "name", "color_hex")
+    ):
+        categories[category_id] = name
+        yield dumps({"type": "category", "name": name, "color_hex": color_hex}) + b"\n"
+
+    notes = (
+        Note.objects.filter(user=user)
+        .order_by("id")
+        .values_list("id", "category_id", "title", "content", "created_at", "updated_at")
+        .iterator(chunk_size=settings.NOTES_EXPORT_CHUNK_SIZE)
+    )
+    for note_id, category_id, title, content, created_at, updated_at in notes:
+        yield dumps(
+            {
+                "type": "note",
+                "id": note_id,
+                "category": categories.get(category_id),
+                "title": title,
+                "content": content,
+                "created_at": format_datetime(created_at),
+                "updated_at": format_datetime(updated_at),
+            }
+        ) + b"\n"
+
+
+class NoteImporter:
+    """
+    Consume NDJSON lines (as produced by export_lines) and insert notes in
+    bulk_create batches. Categories are matched by name and created when
+    missing. Imported notes get fresh ids and timestamps.
+    """
+
+    def __init__(self, user, batch_size: int | None = None):
+        self.user = user
+        self.batch_size = batch_size or settings.NOTES_IMPORT_BATCH_SIZE
+        self.categories = {c.name: c for c in Category.objects.filter(user=user)}
+        self.pending: list[Note] = []
+        self.notes_created = 0
+        self.categories_created = 0
+        self.errors: list[dict] = []
+
+    def error(self, line_number: int, detail) -> None:
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line_number, "detail": detail})
+
+    def category(self, name: str | None, color_hex: str | None = None) -> Category:
+        if not isinstance(name, str) or not name:
+            name = "Random Thoughts"
+        # Look up by the name as stored, so names that only differ past the
+        # column length share one category instead of colliding on insert.
+        name = name[:CATEGORY_NAME_LENGTH]
+        category = self.categories.get(name)
+        if category is None:
+            category = Category.objects.create(
+                user=self.user, name=name, color_hex=color_hex or DEFAULT_CATEGORY_COLOR
+            )
+            self.categories[name] = category
+            self.categories_created += 1
+        return category
+
+    def feed(self, line_number: int, raw: bytes) -> None:
+        if not raw.strip():
+            return
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            self.error(line_number, "Invalid JSON.")
+            return
+        if not isinstance(record, dict):
+            self.error(line_number, "Expected an object.")
+            return
+
+        if record.get("type") == "category":
+            if not record.get("name") or not isinstance(record["name"], str):
+                self.error(line_number, "Category name is required.")
+                return
+            color_hex = record.get("color_hex")
+            if color_hex is not None and not (
+                isinstance(color_hex, str) and COLOR_HEX_RE.fullmatch(color_hex)
+            ):
+                self.error(line_number, "color_hex must be a #RRGGBB string.")
+                return
+            self.category(record["name"], color_hex)
+            return
+
+        if record.get("type") != "note":
+            self.error(line_number, "Unknown record type.")
+            return
+
+        serializer = NoteCreateSerializer(
+            data={
+                "title": record.get("title") or DEFAULT_NOTE_TITLE,
+                "content": record.get("content") or DEFAULT_NOTE_CONTENT,
+            }
+        )
+        if not serializer.is_valid():
+            self.error(line_number, serializer.errors)
+            return
+        note = Note(
+            user=self.user,
+            category=self.category(record.get("category")),
+            title=serializer.validated_data["title"][:255],
+            content=serializer.validated_data["content"],
+        )
+        note.refresh_placeholder()
+        self.pending.append(note)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        notes, self.pending = self.pending, []
+        # bulk_create skips the Note signals; do their bookkeeping per batch.
+        with transaction.atomic():
+            change_seq = counters.bump_version(self.user.id, notes_delta=len(notes))
+            for note in notes:
+                note.change_seq = change_seq
+            Note.objects.bulk_create(notes)
+            counters.apply_note_changes(
+                self.user.id, [(None, note.counter_state()) for note in notes]
+            )
+            get_search_backend().index_notes(notes)
+        self.notes_created += len(notes)
+
+    def run(self, lines) -> dict:
+        for line_number, raw in enumerate(lines, start=1):
+            self.feed(line_number, raw)
+        self.flush()
+        return {
+            "notes_created": self.notes_created,
+            "categories_created": self.categories_created,
+            "errors": self.errors,
+        }
@@ -1,10 +1,25 @@
+from django.conf import settings
 from django.urls import path
 
-from apps.notes import views
+from apps.notes import async_views, views
+
+if settings.NOTES_ASYNC_VIEWS:
+    notes_view = async_views.notes_list
+    note_detail_view = async_views.note_detail
+    summary_view = async_views.notes_summary
+else:
+    notes_view = views.NotesListCreateView.as_view()
+    note_detail_view = views.NoteDetailView.as_view()
+    summary_view = views.NotesSummaryView.as_view()
 
 urlpatterns = [
     path("categories", views.CategoriesListView.as_view(), name="categories"),
-    path("notes", views.NotesListCreateView.as_view(), name="notes"),
-    path("notes/summary", views.NotesSummaryView.as_view(), name="notes-summary"),
-    path("notes/<int:note_id>", views.NoteDetailView.as_view(), name="note-detail"),
+    path("notes", notes_view, name="notes"),
+    path("notes/batch", views.NotesBatchView.as_view(), name="notes-batch"),
+    path("notes/export", views.NotesExportView.as_view(), name="notes-export"),
+    path("notes/import", views.NotesImportView.as_view(), name="notes-import"),
+    path("notes/changes", views.NotesChangesView.as_view(), name="notes-changes"),
+    path("notes/search", views.NotesSearchView.as_view(), name="notes-search"),
+    path("notes/summary", summary_view, name="notes-summary"),
+    path("notes/<int:note_id>", note_detail_view, name="note-detail"),
 ]
@@ -1,11 +1,32 @@
-from django.db.models import Count
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import Substr
+from django.http import HttpResponse, StreamingHttpResponse
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.notes.models import Note, Category
+from apps.notes import counters, fast_serializers
+from apps.notes.batch import BatchError, run_batch
+from apps.notes.cache import get_user_categories
+from apps.notes.conditional import (
+    check_write_preconditions,
+    conditional_get,
+    etag_for_note,
+    get_user_note,
+    library_etag,
+    library_last_modified,
+    note_etag,
+    note_last_modified,
+)
+from apps.notes.models import Note
+from apps.notes.pagination import InvalidCursor, paginate_notes, parse_page_size
+from apps.notes.search import search_notes
+from apps.notes.sync import SyncTokenExpired, changes_since
+from apps.notes.transfer import NoteImporter, export_lines
 from apps.notes.serializers import (
     NoteSerializer,
+    NoteListSerializer,
     NoteCreateSerializer,
     NoteUpdateSerializer,
     CategorySerializer,
@@ -15,20 +36,88 @@ from apps.notes.serializers import (
 class CategoriesListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional_get(library_etag, library_last_modified)
     def get(self, request):
-        qs = Category.objects.filter(user=request.user).order_by("id")
-        return Response(CategorySerializer(qs, many=True).data)
+        categories = get_user_categories(request.user.id)
+        return Response(CategorySerializer(categories, many=True).data)
 
 
 class NotesListCreateView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @staticmethod
+    def _compact_fields(request) -> list[str] | None:
+        fields = request.query_params.get("fields")
+        if fields:
+            return [name.strip() for name in fields.split(",") if name.strip()]
+        if request.query_params.get("view") == "compact":
+            return list(NoteListSerializer.Meta.fields)
+        return None
+
+    @staticmethod
+    def _use_fast_path(request) -> bool:
+        return settings.NOTES_FAST_SERIALIZATION and request.accepted_renderer.format == "json"
+
+    def _fast_list(self, request, qs):
+        rows = fast_serializers.note_rows(qs)
+        cursor = request.query_params.get("cursor")
+        limit = request.query_params.get("limit")
+        if cursor is None and limit is None:
+            body = fast_serializers.encode_notes(rows)
+        else:
+            try:
+                rows, next_cursor = paginate_notes(
+                    rows, cursor, parse_page_size(limit), key=fast_serializers.row_key
+                )
+            except InvalidCursor as exc:
+                return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+            body = fast_serializers.encode_page(rows, next_cursor)
+        return HttpResponse(body, content_type="application/json")
+
+    @conditional_get(library_etag, library_last_modified)
     def get(self, request):
-        qs = Note.objects.filter(user=request.user).select_related("category")
+        qs = Note.objects.filter(user=request.user)
         category_name = request.query_params.get("category")
         if category_name:
             qs = qs.filter(category__name=category_name)
-        return Response(NoteSerializer(qs, many=True).data)
+
+        fields = self._compact_fields(request)
+        if fields is None and self._use_fast_path(request):
+            return self._fast_list(request, qs)
+        if fields is None:
+            qs = qs.select_related("category")
+        else:
+            unknown = sorted(set(fields) - set(NoteListSerializer.Meta.fields))
+            if unknown:
+                return Response(
+                    {"detail": f"Unknown fields: {', '.join(unknown)}."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            # Never read the full content column; the preview is cut by the database.
+            model_fields = {"id", "updated_at"} | ({"title", "created_at"} & set(fields))
+            if "category_id" in fields:
+                model_fields.add("category")
+            qs = qs.only(*model_fields)
+            if "content_preview" in fields:
+                qs = qs.annotate(
+                    content_preview=Substr("content", 1, settings.NOTES_PREVIEW_LENGTH)
+                )
+
+        def serialize(notes):
+            if fields is None:
+                return NoteSerializer(notes, many=True).data
+            return NoteListSerializer(notes, many=True, fields=fields).data
+
+        cursor = request.query_params.get("cursor")
+        limit = request.query_params.get("limit")
+        if cursor is None and limit is None:
+            return Response(serialize(qs))
+
+        try:
+            notes, next_cursor = paginate_notes(qs, cursor, parse_page_size(limit))
+        except InvalidCursor as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"results": serialize(notes), "next_cursor": next_cursor})
 
     def post(self, request):
         serializer = NoteCreateSerializer(data=request.data, context={"request": request})
@@ -40,63 +129,140 @@ class NotesListCreateView(APIView):
 class NoteDetailView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
-    def _get(self, request, note_id):
-        return Note.objects.select_related("category").get(id=note_id, user=request.user)
+    def _get_for_update(self, request, note_id):
+        return (
+            Note.objects.select_related("category")
+            .select_for_update(of=("self",))
+            .get(id=note_id, user=request.user)
+        )
 
+    @conditional_get(note_etag, note_last_modified)
     def get(self, request, note_id):
         try:
-            note = self._get(request, note_id)
+            note = get_user_note(request, note_id)
         except Note.DoesNotExist:
             return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
         return Response(NoteSerializer(note).data)
 
     def patch(self, request, note_id):
-        try:
-            note = self._get(request, note_id)
-        except Note.DoesNotExist:
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        with transaction.atomic():
+            try:
+                note = self._get_for_update(request, note_id)
+            except Note.DoesNotExist:
+                return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        serializer = NoteUpdateSerializer(
-            note, data=request.data, partial=True, context={"request": request}
-        )
-        serializer.is_valid(raise_exception=True)
-        note = serializer.save()
-        return Response(NoteSerializer(note).data)
+            # Autosaves send If-Match with the ETag they last saw; a stale one
+            # is rejected here instead of overwriting a newer edit.
+            precondition_failed = check_write_preconditions(request, note)
+            if precondition_failed is not None:
+                return precondition_failed
 
-    def delete(self, request, note_id):
-        try:
-            note = self._get(request, note_id)
-        except Note.DoesNotExist:
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+            serializer = NoteUpdateSerializer(
+                note, data=request.data, partial=True, context={"request": request}
+            )
+            serializer.is_valid(raise_exception=True)
+            note = serializer.save()
+
+        response = Response(NoteSerializer(note).data)
+        response["ETag"] = etag_for_note(note)
+        return response
 
-        note.delete()
+    def delete(self, request, note_id):
+        # Locked like patch: a concurrent DELETE of the same note waits here,
+        # then finds it gone and answers 404.
+        with transaction.atomic():
+            try:
+                note = self._get_for_update(request, note_id)
+            except Note.DoesNotExist:
+                return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+            note.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class NotesSummaryView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional_get(library_etag, library_last_modified)
     def get(self, request):
-        qs = Note.objects.filter(user=request.user)
-        visible_qs = qs.exclude(
-            title="Note Title",
-            content="Pour your heart out...",
-        )
+        rows = counters.category_counts(request.user.id).values_list("name", "color_hex", "count")
+        return Response(counters.summarize_categories(rows))
 
-        counts = visible_qs.values("category__name").annotate(count=Count("id"))
-        counts_map = {c["category__name"]: c["count"] for c in counts}
 
-        categories = Category.objects.filter(user=request.user).order_by("id")
-        categories_out = [
-            {"name": c.name, "color_hex": c.color_hex, "count": counts_map.get(c.name, 0)}
-            for c in categories
-        ]
+class NotesChangesView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
 
+    def get(self, request):
+        try:
+            changes = changes_since(
+                request.user,
+                request.query_params.get("since"),
+                parse_page_size(request.query_params.get("limit")),
+            )
+        except InvalidCursor as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except SyncTokenExpired:
+            return Response(
+                {"detail": "Sync token expired; sync again without since."},
+                status=status.HTTP_410_GONE,
+            )
+        changes["upserts"] = NoteSerializer(changes["upserts"], many=True).data
+        return Response(changes)
+
+
+class NotesBatchView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        operations = request.data.get("operations") if hasattr(request.data, "get") else None
+        try:
+            results = run_batch(request.user, operations)
+        except BatchError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"results": results})
+
+
+class NotesSearchView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"detail": "q is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = parse_page_size(request.query_params.get("limit"))
+            offset = int(request.query_params.get("offset") or 0)
+        except (InvalidCursor, ValueError):
+            return Response({"detail": "Invalid limit."}, status=status.HTTP_400_BAD_REQUEST)
+        offset = max(offset, 0)
+
+        results = search_notes(request.user, query, limit, offset)
         return Response(
             {
-                "has_notes": visible_qs.exists(),
-                "total_notes": visible_qs.count(),
-                "default_category": "Random Thoughts",
-                "categories": categories_out,
+                "results": results,
+                "next_offset": offset + limit if len(results) == limit else None,
             }
         )
+
+
+class NotesExportView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        response = StreamingHttpResponse(
+            export_lines(request.user), content_type="application/x-ndjson"
+        )
+        response["Content-Disposition"] = 'attachment; filename="notes.ndjson"'
+        return response
+
+
+class NotesImportView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        # Read the raw body line by line; touching request.data would parse
+        # (and buffer) the whole upload.
+        stream = request.stream
+        if stream is None:
+            return Response({"detail": "Empty upload."}, status=status.HTTP_400_BAD_REQUEST)
+        result = NoteImporter(request.user).run(stream)
+        return Response(result, status=status.HTTP_201_CREATED)
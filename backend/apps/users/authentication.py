@@ -0,0 +1,104 @@
+import copy
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from config.cache import MISSING, LocalTTLCache
+
+_config = settings.AUTH_USER_CACHE
+_users = LocalTTLCache(_config["MAX_ENTRIES"], _config["TTL"])
+
+
+def _cache_key(validated_token):
+    # simplejwt writes the user id claim as a string; invalidation uses pks.
+    return str(validated_token.get(api_settings.USER_ID_CLAIM)), validated_token.get("iat")
+
+
+def _cached_user(validated_token):
+    user = _users.get(_cache_key(validated_token))
+    # Hand out a copy so one request cannot leak attribute changes into another.
+    return MISSING if user is MISSING else copy.copy(user)
+
+
+def invalidate_user(user_id) -> None:
+    """
+    Forget every cached token of a user. Runs immediately and again on commit,
+    so a concurrent request cannot re-cache the pre-commit row.
+    """
+
+    def purge():
+        _users.delete_matching(lambda key: key[0] == str(user_id))
+
+    purge()
+    transaction.on_commit(purge)
+
+
+def clear_user_cache() -> None:
+    _users.clear()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that remembers the user behind a token for a short TTL,
+    keyed by (user id, iat), instead of loading it on every request. Saving
+    or deleting a user drops its entries (apps.users.signals), but only in
+    the process that made the change: other gunicorn workers keep accepting
+    a deactivated user's or a changed password's tokens until their entries
+    expire, so AUTH_USER_CACHE["TTL"] bounds how long that can last.
+    """
+
+    def get_user(self, validated_token):
+        user = _cached_user(validated_token)
+        if user is MISSING:
+            user = super().get_user(validated_token)
+            _users.set(_cache_key(validated_token), user)
+        return user
+
+
+class AsyncJWTAuthentication(CachedJWTAuthentication):
+    """
+    JWTAuthentication for native async views: token parsing is unchanged,
+    the user is loaded with the async ORM.
+    """
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user = _cached_user(validated_token)
+        if user is not MISSING:
+            return user
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = await self.user_model.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).afirst()
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(
+                user.password
+            ):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+        _users.set(_cache_key(validated_token), user)
+        return user
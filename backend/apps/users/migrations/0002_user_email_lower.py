@@ -0,0 +1,50 @@
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def lowercase_emails(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    # Logins lowercase the address and match it exactly, so an account whose
+    # email only differs by case from another's could never sign in again.
+    # Stop before touching anything and let an operator merge them.
+    clashes = (
+        User.objects.annotate(email_lower=Lower("email"))
+        .values("email_lower")
+        .annotate(accounts=Count("id"))
+        .filter(accounts__gt=1)
+        .values_list("email_lower", flat=True)
+    )
+    conflicts = {}
+    for user_id, email in (
+        User.objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=clashes)
+        .order_by("email_lower", "id")
+        .values_list("id", "email")
+    ):
+        conflicts.setdefault(email.lower(), []).append(f"{email} (id {user_id})")
+    if conflicts:
+        listing = "\n".join(
+            f"  {email}: {', '.join(accounts)}" for email, accounts in conflicts.items()
+        )
+        raise RuntimeError(
+            "Cannot lowercase emails: these accounts differ only by case. Merge or "
+            f"rename them, then run the migration again.\n{listing}"
+        )
+
+    for user in User.objects.exclude(email=Lower("email")).only("id", "email").iterator():
+        User.objects.filter(id=user.id).update(email=user.email.lower())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(Lower("email"), name="user_email_lower_idx"),
+        ),
+    ]
@@ -1,9 +1,18 @@
 from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
 from django.contrib.auth.models import PermissionsMixin
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class UserManager(BaseUserManager):
+    @classmethod
+    def normalize_email(cls, email):
+        # Store the whole address lowercased so lookups are exact index probes.
+        return super().normalize_email(email).lower()
+
+    def get_by_natural_key(self, username):
+        return self.get(**{self.model.USERNAME_FIELD: self.normalize_email(username)})
+
     def create_user(self, email: str, password: str | None = None, **extra_fields):
         if not email:
             raise ValueError("Email is required")
@@ -37,5 +46,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS: list[str] = []
 
+    class Meta:
+        indexes = [models.Index(Lower("email"), name="user_email_lower_idx")]
+
     def __str__(self) -> str:
         return self.email
@@ -1,4 +1,5 @@
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
 from rest_framework import serializers
 
 from apps.notes.models import Category
@@ -22,20 +23,33 @@ class RegisterSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True, min_length=8)
 
     def validate_email(self, value):
-        if User.objects.filter(email__iexact=value).exists():
+        # LOWER(email) = %s is served by user_email_lower_idx; email__iexact
+        # compiles to LIKE / UPPER() and cannot use it.
+        exists = (
+            User.objects.alias(email_lower=Lower("email"))
+            .filter(email_lower=User.objects.normalize_email(value))
+            .exists()
+        )
+        if exists:
             raise serializers.ValidationError("Email already registered")
         return value
 
     def create(self, validated_data):
-        with transaction.atomic():
-            user = User.objects.create_user(
-                email=validated_data["email"],
-                password=validated_data["password"],
-            )
-            for name, color_hex in DEFAULT_CATEGORIES:
-                Category.objects.get_or_create(
-                    user=user,
-                    name=name,
-                    defaults={"color_hex": color_hex},
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    email=validated_data["email"],
+                    password=validated_data["password"],
                 )
+                # A new user has no cached categories or library version yet,
+                # so skipping the Category signals loses nothing.
+                Category.objects.bulk_create(
+                    [
+                        Category(user=user, name=name, color_hex=color_hex)
+                        for name, color_hex in DEFAULT_CATEGORIES
+                    ]
+                )
+        except IntegrityError as exc:
+            # Lost a race with a concurrent signup for the same address.
+            raise serializers.ValidationError({"email": ["Email already registered"]}) from exc
         return user
@@ -1,11 +1,18 @@
+import importlib
+
 import pytest
+from django.apps import apps as django_apps
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from apps.notes.models import Category
+from apps.notes.models import Category, Note
 from apps.users.models import User
 
-pytestmark = pytest.mark.django_db
+email_migration = importlib.import_module("apps.users.migrations.0002_user_email_lower")
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("query_baseline")]
 
 
 def _client():
@@ -80,3 +87,144 @@ def test_bootstrap_returns_ui_state():
     assert response.data["user"]["email"] == "bootstrap@example.com"
     assert response.data["ui"]["has_notes"] is False
     assert response.data["ui"]["landing_route"] == "/notes"
+
+
+def _authenticated_client(user):
+    client = _client()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+    return client
+
+
+def _user_queries(context):
+    return [q["sql"] for q in context.captured_queries if 'FROM "users_user"' in q["sql"]]
+
+
+def test_authenticated_user_is_cached_between_requests():
+    user = User.objects.create_user(email="cached@example.com", password="StrongPass123")
+    client = _authenticated_client(user)
+
+    with CaptureQueriesContext(connection) as first:
+        assert client.get("/api/auth/me").status_code == 200
+    with CaptureQueriesContext(connection) as second:
+        response = client.get("/api/auth/me")
+
+    assert response.status_code == 200
+    assert response.data["email"] == "cached@example.com"
+    assert len(_user_queries(first)) == 1
+    assert _user_queries(second) == []
+
+
+def test_deactivated_user_is_rejected_despite_cache():
+    user = User.objects.create_user(email="gone@example.com", password="StrongPass123")
+    client = _authenticated_client(user)
+    assert client.get("/api/auth/me").status_code == 200
+
+    user.is_active = False
+    user.save(update_fields=["is_active"])
+
+    assert client.get("/api/auth/me").status_code == 401
+
+
+def test_email_is_normalized_and_matched_case_insensitively():
+    client = _client()
+    response = client.post(
+        "/api/auth/register",
+        {"email": "Mixed.Case@Example.COM", "password": "StrongPass123"},
+        format="json",
+    )
+    assert response.status_code == 201
+    assert response.data["user"]["email"] == "mixed.case@example.com"
+
+    duplicate = client.post(
+        "/api/auth/register",
+        {"email": "MIXED.case@example.com", "password": "StrongPass123"},
+        format="json",
+    )
+    assert duplicate.status_code == 400
+    assert "email" in duplicate.data
+
+    login = client.post(
+        "/api/auth/login",
+        {"email": "MIXED.CASE@example.com", "password": "StrongPass123"},
+        format="json",
+    )
+    assert login.status_code == 200
+
+
+def test_email_migration_refuses_accounts_that_differ_only_by_case():
+    User.objects.bulk_create(
+        [
+            User(email="Dup@Example.com"),
+            User(email="dup@example.com"),
+            User(email="Solo@Example.com"),
+        ]
+    )
+
+    with pytest.raises(RuntimeError) as excinfo:
+        email_migration.lowercase_emails(django_apps, None)
+
+    assert "dup@example.com: Dup@Example.com (id " in str(excinfo.value)
+    assert "solo" not in str(excinfo.value).lower()
+    assert User.objects.filter(email="Solo@Example.com").exists()
+
+    User.objects.filter(email="Dup@Example.com").delete()
+    email_migration.lowercase_emails(django_apps, None)
+    assert User.objects.filter(email="solo@example.com").exists()
+
+
+def test_register_provisions_categories_in_one_insert():
+    with CaptureQueriesContext(connection) as context:
+        response = _client().post(
+            "/api/auth/register",
+            {"email": "bulk@example.com", "password": "StrongPass123"},
+            format="json",
+        )
+    assert response.status_code == 201
+    category_queries = [q["sql"] for q in context.captured_queries if "notes_category" in q["sql"]]
+    assert len(category_queries) == 1
+    assert category_queries[0].startswith("INSERT")
+    duplicate_check = next(q["sql"] for q in context.captured_queries if "LOWER(" in q["sql"])
+    assert 'LOWER("users_user"."email")' in duplicate_check
+
+
+def test_bootstrap_includes_summary_in_one_query():
+    user = User.objects.create_user(email="firstpaint@example.com", password="StrongPass123")
+    school = Category.objects.create(user=user, name="School", color_hex="#FCDC94")
+    Note.objects.create(user=user, category=school, title="Exam", content="Revise")
+    client = _authenticated_client(user)
+    client.get("/api/auth/me")  # resolve and cache the token's user
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get("/api/auth/bootstrap")
+
+    assert response.status_code == 200
+    assert len(context.captured_queries) == 1
+    assert response.data["ui"]["has_notes"] is True
+    assert response.data["summary"]["total_notes"] == 1
+    assert response.data["summary"]["categories"] == [
+        {"name": "School", "color_hex": "#FCDC94", "count": 1}
+    ]
+
+
+def test_has_notes_follows_note_creates_and_deletes():
+    user = User.objects.create_user(email="presence@example.com", password="StrongPass123")
+    Category.objects.create(user=user, name="Random Thoughts", color_hex="#EF9C66")
+    client = _authenticated_client(user)
+
+    def login_has_notes():
+        response = _client().post(
+            "/api/auth/login",
+            {"email": "presence@example.com", "password": "StrongPass123"},
+            format="json",
+        )
+        return response.data["ui"]["has_notes"]
+
+    assert login_has_notes() is False
+    # A fresh placeholder note counts: the user has started a library.
+    note_id = client.post("/api/notes", {}, format="json").data["id"]
+    assert login_has_notes() is True
+    assert client.get("/api/auth/bootstrap").data["ui"]["has_notes"] is True
+
+    client.delete(f"/api/notes/{note_id}")
+    assert login_has_notes() is False
+    assert client.get("/api/auth/bootstrap").data["ui"]["has_notes"] is False
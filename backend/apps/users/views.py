@@ -5,7 +5,7 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
 
-from apps.notes.models import Note
+from apps.notes.counters import has_notes, library_overview
 from apps.users.serializers import RegisterSerializer, UserSerializer
 
 User = get_user_model()
@@ -19,17 +19,15 @@ def _issue_tokens(user):
     }
 
 
-def _post_login_payload(user):
+def _post_login_payload(user, user_has_notes: bool | None = None):
     """
     Decide what the frontend should show after login.
     """
-    has_notes = Note.objects.filter(user=user).exists()
-
     return {
         "user": UserSerializer(user).data,
         "tokens": _issue_tokens(user),
         "ui": {
-            "has_notes": has_notes,
+            "has_notes": has_notes(user.id) if user_has_notes is None else user_has_notes,
             "default_category": "Random Thoughts",
             "landing_route": "/notes",
         },
@@ -43,9 +41,8 @@ class RegisterView(APIView):
         serializer = RegisterSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-        payload = _post_login_payload(user)
+        payload = _post_login_payload(user, user_has_notes=False)
         payload["ui"]["landing_route"] = "/notes"
-        payload["ui"]["has_notes"] = False
         return Response(payload, status=status.HTTP_201_CREATED)
 
 
@@ -75,15 +72,18 @@ class MeView(APIView):
 
 class BootstrapView(APIView):
     def get(self, request):
-        has_notes = Note.objects.filter(user=request.user).exists()
+        # Everything the first screen needs: the user, the landing decision and
+        # the notes summary, in one request and one query.
+        summary, user_has_notes = library_overview(request.user.id)
         return Response(
             {
                 "user": UserSerializer(request.user).data,
                 "ui": {
-                    "has_notes": has_notes,
+                    "has_notes": user_has_notes,
                     "default_category": "Random Thoughts",
                     "landing_route": "/notes",
                 },
+                "summary": summary,
             },
             status=status.HTTP_200_OK,
         )
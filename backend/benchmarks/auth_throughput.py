@@ -0,0 +1,83 @@
+"""
+Signup and login throughput per password hasher.
+
+Runs POST /api/auth/register and POST /api/auth/login through the Django
+test client against a throwaway SQLite database, once per hasher, so the
+numbers include the full request path (validation, user and category
+inserts, token issuing) and are dominated by the hasher's work factor.
+
+    python benchmarks/auth_throughput.py --users 50
+    python benchmarks/auth_throughput.py --hashers pbkdf2,scrypt --pbkdf2-iterations 600000
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from harness import setup_django
+
+
+def run_hasher(name: str, users: int, iterations: int) -> dict:
+    from django.conf import settings
+    from django.contrib.auth.hashers import make_password
+    from django.test import Client, override_settings
+
+    choices = settings.PASSWORD_HASHER_CHOICES
+    hashers = [choices[name]] + [path for key, path in choices.items() if key != name]
+    client = Client()
+    password = "BenchmarkPass123"
+    with override_settings(PASSWORD_HASHERS=hashers, PASSWORD_PBKDF2_ITERATIONS=iterations):
+        try:
+            make_password(password)
+        except ValueError as exc:  # hasher library not installed
+            return {"hasher": name, "skipped": str(exc)}
+
+        emails = [f"{name}-{time.time_ns()}-{i}@example.com" for i in range(users)]
+        start = time.perf_counter()
+        for email in emails:
+            response = client.post(
+                "/api/auth/register",
+                {"email": email, "password": password},
+                content_type="application/json",
+            )
+            assert response.status_code == 201, response.content
+        signup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for email in emails:
+            response = client.post(
+                "/api/auth/login",
+                {"email": email, "password": password},
+                content_type="application/json",
+            )
+            assert response.status_code == 200, response.content
+        login = time.perf_counter() - start
+    return {
+        "hasher": name,
+        "users": users,
+        "signup_per_s": round(users / signup, 1),
+        "login_per_s": round(users / login, 1),
+        "signup_ms": round(signup / users * 1000, 2),
+        "login_ms": round(login / users * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--hashers", default="pbkdf2,scrypt,argon2,bcrypt")
+    parser.add_argument("--pbkdf2-iterations", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(str(Path(tmp) / "bench.sqlite3"))
+        for name in args.hashers.split(","):
+            print(json.dumps(run_hasher(name, args.users, args.pbkdf2_iterations)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Concurrent editor sessions replaying the frontend's autosave pattern.
+
+Each virtual editor is a thread that opens the app (bootstrap, notes list),
+opens or creates a note, then "types": after every burst of keystrokes it
+waits out the editor's 600 ms debounce and PATCHes title, content and
+category_name, one save in flight at a time, exactly as
+frontend/src/app/notes/[id]/page.tsx does. After --saves-per-note saves it
+goes back to the list (notes + summary) and picks another note.
+
+Requests run in-process through the Django test client against a
+throwaway SQLite file, so writers contend for the database as they would
+on a single-node deployment. --time-scale shrinks every pause (0.1 turns
+the 600 ms debounce into 60 ms) to push more load through a short run.
+
+    python benchmarks/autosave_scenario.py --editors 16 --duration 30 --output autosave.json
+"""
+
+import argparse
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from harness import print_table, setup_django, summarize, write_results
+
+DEBOUNCE_MS = 600
+WORDS = "the quick brown fox jumps over a lazy dog while notes autosave quietly".split()
+
+
+class Editor(threading.Thread):
+    def __init__(self, index, authorization, args, deadline, latencies, errors):
+        super().__init__(name=f"editor-{index}")
+        self.authorization = authorization
+        self.args = args
+        self.deadline = deadline
+        self.latencies = latencies
+        self.errors = errors
+        self.random = random.Random(index)
+
+    def request(self, kind, method, path, data=None, expect=200):
+        # Failures are counted per request and the editor carries on, so one
+        # 500 or lock timeout never takes an editor out of the run.
+        start = time.perf_counter()
+        try:
+            response = getattr(self.client, method)(path, data, content_type="application/json")
+        except Exception as exc:  # noqa: BLE001 - counted, the run goes on
+            self.latencies[kind].append(time.perf_counter() - start)
+            self.errors[f"{kind}:{type(exc).__name__}"] += 1
+            return None
+        elapsed = time.perf_counter() - start
+        self.latencies[kind].append(elapsed)
+        if response.status_code != expect:
+            self.errors[f"{kind}:{response.status_code}"] += 1
+            return None
+        try:
+            return response.json() if response.content else None
+        except ValueError:
+            self.errors[f"{kind}:invalid-json"] += 1
+            return None
+
+    def pause(self, ms):
+        time.sleep(ms * self.args.time_scale / 1000)
+
+    def open_note(self, notes):
+        if notes and self.random.random() < 0.7:
+            note = self.random.choice(notes)
+            return self.request("detail", "get", f"/api/notes/{note['id']}")
+        return self.request("create", "post", "/api/notes", {}, expect=201)
+
+    def run(self):
+        from django.db import connections
+        from django.test import Client
+
+        # Server errors come back as 500 responses instead of being re-raised.
+        self.client = Client(HTTP_AUTHORIZATION=self.authorization, raise_request_exception=False)
+        try:
+            self.request("bootstrap", "get", "/api/auth/bootstrap")
+            while time.perf_counter() < self.deadline:
+                notes = self.request("list", "get", "/api/notes?limit=50")
+                self.request("summary", "get", "/api/notes/summary")
+                note = self.open_note((notes or {}).get("results", []))
+                if note is None:
+                    # Back off as the frontend would before retrying.
+                    self.pause(DEBOUNCE_MS)
+                    continue
+                content = note["content"]
+                category = (note.get("category") or {}).get("name")
+                for _ in range(self.args.saves_per_note):
+                    if time.perf_counter() >= self.deadline:
+                        break
+                    # A burst of typing, then the debounce elapses and the save fires.
+                    self.pause(self.random.uniform(0, self.args.think_ms))
+                    content += " " + " ".join(self.random.choices(WORDS, k=self.random.randint(1, 6)))
+                    self.pause(DEBOUNCE_MS)
+                    self.request(
+                        "patch",
+                        "patch",
+                        f"/api/notes/{note['id']}",
+                        {"title": note["title"], "content": content, "category_name": category},
+                    )
+        finally:
+            connections.close_all()
+
+
+def create_editors(count: int) -> list[str]:
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from apps.notes.models import Category
+    from apps.users.models import User
+    from apps.users.serializers import DEFAULT_CATEGORIES
+
+    tokens = []
+    for index in range(count):
+        user = User.objects.create_user(email=f"editor-{index}@example.com", password="x" * 12)
+        Category.objects.bulk_create(
+            [Category(user=user, name=name, color_hex=color) for name, color in DEFAULT_CATEGORIES]
+        )
+        tokens.append(f"Bearer {RefreshToken.for_user(user).access_token}")
+    return tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--editors", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--saves-per-note", type=int, default=10)
+    parser.add_argument("--think-ms", type=float, default=1500, help="Max typing time per burst.")
+    parser.add_argument("--time-scale", type=float, default=0.1)
+    parser.add_argument("--output", help="Write a results file here.")
+    args = parser.parse_args()
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(str(Path(tmp) / "bench.sqlite3"))
+        tokens = create_editors(args.editors)
+        started = time.perf_counter()
+        deadline = started + args.duration
+        editors = [
+            Editor(index, token, args, deadline, latencies, errors)
+            for index, token in enumerate(tokens)
+        ]
+        for editor in editors:
+            editor.start()
+        for editor in editors:
+            editor.join()
+        elapsed = time.perf_counter() - started
+
+    label = f"autosave[editors={args.editors}]"
+    total = sum(len(values) for values in latencies.values())
+    overall = summarize([value for values in latencies.values() for value in values])
+    overall["ops"] = total / elapsed
+    results = [
+        {
+            "name": label,
+            "group": "scenario",
+            "stats": overall,
+            "extra": {"requests": total, "errors": dict(errors), "time_scale": args.time_scale},
+        }
+    ]
+    for kind, values in sorted(latencies.items()):
+        stats = summarize(values)
+        stats["ops"] = len(values) / elapsed
+        results.append({"name": f"{label}:{kind}", "group": "scenario", "stats": stats, "extra": {}})
+
+    print_table(results)
+    if errors:
+        print(f"errors: {dict(errors)}")
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
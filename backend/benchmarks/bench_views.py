@@ -0,0 +1,129 @@
+"""
+Per-view micro-benchmarks at several library sizes.
+
+Each view is called through the Django test client (full middleware and
+authentication stack, no network) against a throwaway SQLite database,
+for a user holding --sizes notes.
+
+    python benchmarks/bench_views.py --output results.json
+    python benchmarks/bench_views.py --sizes 10,1000 --rounds 100 --only notes-list,note-patch
+"""
+
+import argparse
+import itertools
+import json
+import tempfile
+from pathlib import Path
+
+from harness import measure, print_table, setup_django, write_results
+
+VIEWS = (
+    "notes-list",
+    "notes-page",
+    "note-detail",
+    "notes-summary",
+    "bootstrap",
+    "note-create",
+    "note-patch",
+)
+
+
+def seed_library(size: int):
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from apps.notes.models import Category
+    from apps.notes.transfer import NoteImporter
+    from apps.users.models import User
+    from apps.users.serializers import DEFAULT_CATEGORIES
+
+    user = User.objects.create_user(email=f"bench-{size}@example.com", password="BenchPass123")
+    Category.objects.bulk_create(
+        [Category(user=user, name=name, color_hex=color) for name, color in DEFAULT_CATEGORIES]
+    )
+    names = itertools.cycle(name for name, _ in DEFAULT_CATEGORIES)
+    lines = (
+        json.dumps(
+            {
+                "type": "note",
+                "category": next(names),
+                "title": f"Note {i}",
+                "content": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8,
+            }
+        ).encode()
+        for i in range(size)
+    )
+    NoteImporter(user).run(lines)
+    return user, f"Bearer {RefreshToken.for_user(user).access_token}"
+
+
+def view_calls(user, authorization: str) -> dict:
+    from django.test import Client
+
+    from apps.notes.models import Note
+
+    client = Client(HTTP_AUTHORIZATION=authorization)
+    note_id = Note.objects.filter(user=user).values_list("id", flat=True).first()
+    edits = itertools.count()
+
+    def get(path):
+        def call():
+            response = client.get(path)
+            assert response.status_code == 200, (path, response.status_code)
+
+        return call
+
+    def create():
+        response = client.post("/api/notes", {}, content_type="application/json")
+        assert response.status_code == 201, response.status_code
+
+    def patch():
+        response = client.patch(
+            f"/api/notes/{note_id}",
+            {"content": f"Edited {next(edits)}"},
+            content_type="application/json",
+        )
+        assert response.status_code == 200, response.status_code
+
+    return {
+        "notes-list": get("/api/notes"),
+        "notes-page": get("/api/notes?limit=50"),
+        "note-detail": get(f"/api/notes/{note_id}"),
+        "notes-summary": get("/api/notes/summary"),
+        "bootstrap": get("/api/auth/bootstrap"),
+        "note-create": create,
+        "note-patch": patch,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", default="10,100,1000")
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--only", default=",".join(VIEWS), help="Comma-separated view names.")
+    parser.add_argument("--output", help="Write a results file here.")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(str(Path(tmp) / "bench.sqlite3"))
+        for size in (int(size) for size in args.sizes.split(",")):
+            calls = view_calls(*seed_library(size))
+            for name in args.only.split(","):
+                results.append(
+                    {
+                        "name": f"{name}[{size}]",
+                        "group": "views",
+                        "stats": measure(calls[name], rounds=args.rounds),
+                        "extra": {"library_size": size},
+                    }
+                )
+
+    print_table(results)
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Compare two benchmark results files and flag regressions.
+
+A benchmark regresses when its median or p95 latency grows, or its
+throughput (ops/s) drops, by more than --threshold percent relative to the
+baseline. Benchmarks present in only one file are listed but never fail the
+comparison. Exits 1 when anything regressed, so it can gate CI.
+
+    python benchmarks/compare.py baseline.json current.json --threshold 15
+"""
+
+import argparse
+import sys
+
+from harness import load_results
+
+# (stat, direction): +1 means higher is worse, -1 means lower is worse.
+CHECKS = (("median", 1), ("p95", 1), ("ops", -1))
+
+
+def change(old: float, new: float) -> float:
+    if not old:
+        return 0.0
+    return (new - old) / old * 100
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> tuple[list[str], list[str]]:
+    """
+    Return (report lines, regression lines) for two loaded results files.
+    """
+    old = {bench["name"]: bench["stats"] for bench in baseline["benchmarks"]}
+    new = {bench["name"]: bench["stats"] for bench in current["benchmarks"]}
+    report = [f"{'benchmark':<34} {'median':>9} {'p95':>9} {'ops':>9}"]
+    regressions = []
+    for name in sorted(old.keys() & new.keys()):
+        deltas = {stat: change(old[name][stat], new[name][stat]) for stat, _ in CHECKS}
+        flagged = [
+            stat for stat, direction in CHECKS if deltas[stat] * direction > threshold
+        ]
+        report.append(
+            f"{name:<34} "
+            + " ".join(f"{deltas[stat]:>+8.1f}%" for stat, _ in CHECKS)
+            + ("  REGRESSION" if flagged else "")
+        )
+        for stat in flagged:
+            regressions.append(
+                f"{name}: {stat} {old[name][stat]:.6g} -> {new[name][stat]:.6g} "
+                f"({deltas[stat]:+.1f}%)"
+            )
+    for name in sorted(old.keys() - new.keys()):
+        report.append(f"{name:<34} only in baseline")
+    for name in sorted(new.keys() - old.keys()):
+        report.append(f"{name:<34} new")
+    return report, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Percent.")
+    args = parser.parse_args()
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    report, regressions = compare(baseline, current, args.threshold)
+    print(f"baseline {baseline.get('commit')}  current {current.get('commit')}")
+    print("\n".join(report))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold}%:")
+        print("\n".join(f"  {line}" for line in regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
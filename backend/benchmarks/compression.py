@@ -0,0 +1,109 @@
+"""
+Bytes on the wire and CPU cost of response compression and JSON rendering.
+
+For each library size this fetches the notes list and the NDJSON export
+once, then times every available content-coding (gzip always; br and zstd
+when brotli / zstandard are installed) on those exact bodies, and DRF's
+JSONRenderer against CompactJSONRenderer on the serialized notes. Finally
+it times the full GET /api/notes request with and without Accept-Encoding.
+Seeded notes repeat the same text, so ratios are better than real libraries
+will see; the CPU figures are the useful part.
+
+    python benchmarks/compression.py --sizes 10,100,1000 --output compression.json
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from bench_views import seed_library
+from harness import measure, setup_django, write_results
+
+
+def payloads(authorization: str) -> dict[str, bytes]:
+    from django.test import Client
+
+    client = Client(HTTP_AUTHORIZATION=authorization)
+    export = client.get("/api/notes/export")
+    return {
+        "notes-list": client.get("/api/notes").content,
+        "export": b"".join(export.streaming_content),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", default="10,100,1000")
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--output", help="Write a results file here.")
+    args = parser.parse_args()
+
+    results = []
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(str(Path(tmp) / "bench.sqlite3"))
+        from django.conf import settings
+        from django.test import Client
+        from rest_framework.renderers import JSONRenderer
+
+        from apps.notes.models import Note
+        from apps.notes.serializers import NoteSerializer
+        from config import compression
+        from config.renderers import CompactJSONRenderer
+
+        encodings = compression.available(settings.COMPRESSION["ENCODINGS"])
+        for size in (int(size) for size in args.sizes.split(",")):
+            user, authorization = seed_library(size)
+            for name, body in payloads(authorization).items():
+                for encoding in encodings:
+                    level = settings.COMPRESSION["LEVELS"][encoding]
+                    compressed = len(compression.compress(encoding, level, body))
+                    stats = measure(
+                        lambda: compression.compress(encoding, level, body), rounds=args.rounds
+                    )
+                    label = f"{name}:{encoding}-{level}[{size}]"
+                    extra = {"bytes": len(body), "compressed_bytes": compressed}
+                    results.append(
+                        {"name": label, "group": "compression", "stats": stats, "extra": extra}
+                    )
+                    rows.append((label, len(body), compressed, stats["median"]))
+
+            notes = Note.objects.filter(user=user).select_related("category")
+            data = NoteSerializer(notes, many=True).data
+            for renderer in (JSONRenderer(), CompactJSONRenderer()):
+                body = renderer.render(data)
+                stats = measure(lambda: renderer.render(data), rounds=args.rounds)
+                label = f"render:{type(renderer).__name__}[{size}]"
+                results.append(
+                    {
+                        "name": label,
+                        "group": "rendering",
+                        "stats": stats,
+                        "extra": {"bytes": len(body)},
+                    }
+                )
+                rows.append((label, len(body), len(body), stats["median"]))
+
+            identity = None
+            for accept in ("identity", *encodings):
+                client = Client(HTTP_AUTHORIZATION=authorization, HTTP_ACCEPT_ENCODING=accept)
+                wire = len(client.get("/api/notes").content)
+                identity = identity or wire
+                stats = measure(lambda: client.get("/api/notes"), rounds=args.rounds)
+                label = f"request:{accept}[{size}]"
+                results.append(
+                    {"name": label, "group": "compression", "stats": stats, "extra": {"bytes": wire}}
+                )
+                rows.append((label, identity, wire, stats["median"]))
+
+    print(f"{'benchmark':<34} {'bytes':>10} {'on wire':>10} {'ratio':>7} {'median ms':>10}")
+    for label, raw, wire, median in rows:
+        print(f"{label:<34} {raw:>10} {wire:>10} {wire / raw:>7.2f} {median * 1000:>10.3f}")
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Per-request cost of obtaining a database connection.
+
+Replays the request lifecycle Django's handlers run (request_started, one
+query, request_finished, which closes or keeps the connection according to
+CONN_MAX_AGE) and times it. Every mode runs in a fresh interpreter with the
+matching environment, against the database configured by DB_* variables:
+
+    fresh       DB_CONN_MAX_AGE=0    connect and disconnect per request
+    persistent  DB_CONN_MAX_AGE=600  one connection reused across requests (WSGI only)
+    pool        DB_POOL=True         psycopg pool (PostgreSQL only)
+
+    DB_ENGINE=django.db.backends.postgresql DB_NAME=notes DB_USER=... \\
+        python benchmarks/connection_overhead.py --requests 2000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+MODES = {
+    "fresh": {"DB_CONN_MAX_AGE": "0", "DB_POOL": "False"},
+    "persistent": {"DB_CONN_MAX_AGE": "600", "DB_POOL": "False"},
+    "pool": {"DB_CONN_MAX_AGE": "0", "DB_POOL": "True"},
+}
+
+
+def measure(requests: int) -> dict:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+    from django.core.signals import request_finished, request_started
+    from django.db import connection
+
+    def one_request():
+        request_started.send(sender=None)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+        request_finished.send(sender=None)
+
+    one_request()  # Warm up imports and, for the pool, its first connections.
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter_ns()
+        one_request()
+        timings.append(time.perf_counter_ns() - start)
+    timings.sort()
+    return {
+        "vendor": connection.vendor,
+        "requests": requests,
+        "mean_us": round(sum(timings) / len(timings) / 1000, 1),
+        "p50_us": round(timings[len(timings) // 2] / 1000, 1),
+        "p99_us": round(timings[min(len(timings) - 1, len(timings) * 99 // 100)] / 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--modes", default="fresh,persistent,pool")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.requests)))
+        return
+
+    for mode in args.modes.split(","):
+        env = {**os.environ, **MODES[mode]}
+        if mode == "pool" and "postgresql" not in env.get("DB_ENGINE", ""):
+            print(json.dumps({"mode": mode, "skipped": "pooling needs PostgreSQL"}))
+            continue
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", "--requests", str(args.requests)],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        print(json.dumps({"mode": mode, **json.loads(output)}))
+
+
+if __name__ == "__main__":
+    main()
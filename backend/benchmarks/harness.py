@@ -0,0 +1,142 @@
+"""
+Shared plumbing for the benchmark scripts: a throwaway Django environment,
+a timing loop with pytest-benchmark-like statistics, and the results file.
+
+Results file (JSON, one per run):
+
+    {
+      "format": 1,
+      "created_at": "2024-01-01T12:00:00+00:00",
+      "commit": "abc1234",
+      "machine": {"python": "3.11.7", "platform": "...", "django": "5.2"},
+      "benchmarks": [
+        {
+          "name": "notes-list[1000]",
+          "group": "views",
+          "stats": {"rounds": 50, "min": 0.0021, "median": 0.0024, "mean": 0.0025,
+                    "p95": 0.0031, "max": 0.0040, "stddev": 0.0003, "ops": 416.7},
+          "extra": {}
+        }
+      ]
+    }
+
+Times are seconds per call; "ops" is calls per second (for scenarios, the
+aggregate request throughput). benchmarks/compare.py diffs two such files.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_FORMAT = 1
+
+
+def setup_django(db_path: str) -> None:
+    """
+    Configure Django against a fresh SQLite file and migrate it. Must run
+    before anything imports models.
+    """
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    os.environ["DB_ENGINE"] = "django.db.backends.sqlite3"
+    os.environ["DB_NAME"] = db_path
+    # Keep the request log quiet and off the measured path as far as possible.
+    os.environ["REQUEST_LOG_SAMPLE_RATE"] = "0"
+    os.environ["REQUEST_LOG_SLOW_REQUEST_MS"] = "1e9"
+    os.environ["REQUEST_LOG_SLOW_QUERY_COUNT"] = "1000000"
+    import django
+
+    django.setup()
+    from django.core.management import call_command
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    call_command("migrate", verbosity=0)
+
+
+def summarize(timings: list[float]) -> dict:
+    ordered = sorted(timings)
+    mean = statistics.fmean(ordered)
+    return {
+        "rounds": len(ordered),
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": mean,
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+        "stddev": statistics.pstdev(ordered) if len(ordered) > 1 else 0.0,
+        "ops": 1 / mean if mean else 0.0,
+    }
+
+
+def measure(func, rounds: int = 50, warmup: int = 3, setup=None) -> dict:
+    """
+    Time `func()` `rounds` times after `warmup` untimed calls. `setup()`, if
+    given, runs untimed before every call.
+    """
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        func()
+    timings = []
+    for _ in range(rounds):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path: str, benchmarks: list[dict]) -> None:
+    import django
+
+    document = {
+        "format": RESULTS_FORMAT,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "django": django.get_version(),
+        },
+        "benchmarks": benchmarks,
+    }
+    Path(path).write_text(json.dumps(document, indent=2) + "\n")
+
+
+def load_results(path: str) -> dict:
+    document = json.loads(Path(path).read_text())
+    if document.get("format") != RESULTS_FORMAT:
+        raise ValueError(f"{path}: unsupported results format {document.get('format')!r}")
+    return document
+
+
+def print_table(benchmarks: list[dict]) -> None:
+    print(f"{'benchmark':<34} {'median ms':>10} {'p95 ms':>10} {'ops/s':>10}")
+    for bench in benchmarks:
+        stats = bench["stats"]
+        print(
+            f"{bench['name']:<34} {stats['median'] * 1000:>10.2f} "
+            f"{stats['p95'] * 1000:>10.2f} {stats['ops']:>10.1f}"
+        )
@@ -0,0 +1,174 @@
+"""
+Closed-loop HTTP load generator for comparing serving modes.
+
+Each of --concurrency clients keeps one keep-alive connection open and
+issues GETs back to back for --duration seconds, cycling through --paths.
+Only the standard library is used, so it runs anywhere the backend does.
+
+Sync vs async, same database and worker count:
+
+    # WSGI, threaded workers, DRF views
+    NOTES_ASYNC_VIEWS=False GUNICORN_WORKER_CLASS=gthread GUNICORN_THREADS=8 \\
+        gunicorn -c config/gunicorn.conf.py config.wsgi:application
+    python benchmarks/load_test.py --label sync --concurrency 256
+
+    # ASGI, uvicorn workers, async views
+    gunicorn -c config/gunicorn.conf.py config.asgi:application
+    python benchmarks/load_test.py --label async --concurrency 256
+
+The user is registered on first use and seeded with --seed-notes notes.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = "/api/notes?limit=50,/api/notes/summary,/api/notes/{note_id}"
+
+
+def _post(base_url: str, path: str, payload: dict, token: str | None = None) -> dict:
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    request = urllib.request.Request(
+        base_url + path, data=json.dumps(payload).encode(), headers=headers, method="POST"
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read() or b"null")
+
+
+def prepare_user(base_url: str, email: str, password: str, seed_notes: int) -> tuple[str, int]:
+    credentials = {"email": email, "password": password}
+    try:
+        session = _post(base_url, "/api/auth/register", credentials)
+    except urllib.error.HTTPError:
+        session = _post(base_url, "/api/auth/login", credentials)
+    token = session["tokens"]["access"]
+
+    note_id = None
+    if not session["ui"]["has_notes"]:
+        for start in range(0, seed_notes, 500):
+            operations = [
+                {"op": "create", "title": f"Note {i}", "content": "Lorem ipsum " * 40}
+                for i in range(start, min(start + 500, seed_notes))
+            ]
+            results = _post(base_url, "/api/notes/batch", {"operations": operations}, token)
+            note_id = note_id or results["results"][0]["note"]["id"]
+    if note_id is None:
+        request = urllib.request.Request(
+            base_url + "/api/notes?limit=1", headers={"Authorization": f"Bearer {token}"}
+        )
+        with urllib.request.urlopen(request) as response:
+            note_id = json.loads(response.read())["results"][0]["id"]
+    return token, note_id
+
+
+async def _read_response(reader) -> int:
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed")
+    status = int(status_line.split()[1])
+    length = 0
+    chunked = False
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name = name.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "transfer-encoding" and "chunked" in value.lower():
+            chunked = True
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length:
+        await reader.readexactly(length)
+    return status
+
+
+async def _client(host, port, paths, token, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    index = 0
+    try:
+        while time.perf_counter() < deadline:
+            path = paths[index % len(paths)]
+            index += 1
+            request = (
+                f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+                f"Authorization: Bearer {token}\r\nAccept: application/json\r\n\r\n"
+            )
+            start = time.perf_counter()
+            writer.write(request.encode())
+            status = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors.append(status)
+    except (ConnectionError, asyncio.IncompleteReadError):
+        errors.append("connection")
+    finally:
+        writer.close()
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(base_url, paths, token, concurrency, duration) -> dict:
+    parts = urlsplit(base_url)
+    host, port = parts.hostname, parts.port or 80
+    latencies: list[float] = []
+    errors: list = []
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(
+        *(
+            _client(host, port, paths, token, deadline, latencies, errors)
+            for _ in range(concurrency)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument(
+        "--paths", default=DEFAULT_PATHS, help="Comma-separated; {note_id} is filled in."
+    )
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--email", default="loadtest@example.com")
+    parser.add_argument("--password", default="LoadTestPass123")
+    parser.add_argument("--seed-notes", type=int, default=200)
+    parser.add_argument("--label", default="", help="Tag for the result line, e.g. sync or async.")
+    args = parser.parse_args()
+
+    token, note_id = prepare_user(args.url, args.email, args.password, args.seed_notes)
+    paths = [path.format(note_id=note_id) for path in args.paths.split(",")]
+    result = asyncio.run(run(args.url, paths, token, args.concurrency, args.duration))
+    print(json.dumps({"label": args.label, "concurrency": args.concurrency, **result}))
+
+
+if __name__ == "__main__":
+    main()
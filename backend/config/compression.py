@@ -0,0 +1,125 @@
+import zlib
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional codec
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional codec
+    zstandard = None
+
+
+class GzipStream:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliStream:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdStream:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+CODECS = {"gzip": GzipStream}
+if brotli is not None:
+    CODECS["br"] = BrotliStream
+if zstandard is not None:
+    CODECS["zstd"] = ZstdStream
+
+
+def available(encodings) -> list[str]:
+    return [encoding for encoding in encodings if encoding in CODECS]
+
+
+def negotiate(accept_encoding: str, preferred: list[str]) -> str | None:
+    """
+    Pick a content-coding from an Accept-Encoding header. The client's
+    q-values decide; among equally weighted codings the server's `preferred`
+    order breaks the tie. Returns None for identity.
+    """
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+
+    wildcard = weights.get("*", 0.0)
+    candidates = [
+        (weights.get(encoding, wildcard), -rank, encoding)
+        for rank, encoding in enumerate(preferred)
+    ]
+    best = max(candidates, default=None)
+    if best is None or best[0] <= 0:
+        return None
+    return best[2]
+
+
+def compress(encoding: str, level: int, data: bytes) -> bytes:
+    stream = CODECS[encoding](level)
+    return stream.compress(data) + stream.finish()
+
+
+def compress_chunks(encoding: str, level: int, chunks):
+    # Flush after every chunk so streamed lines reach the client as they are
+    # produced rather than when the compressor's window fills.
+    stream = CODECS[encoding](level)
+    for chunk in chunks:
+        data = stream.compress(chunk) + stream.flush()
+        if data:
+            yield data
+    yield stream.finish()
+
+
+async def acompress_chunks(encoding: str, level: int, chunks):
+    stream = CODECS[encoding](level)
+    async for chunk in chunks:
+        data = stream.compress(chunk) + stream.flush()
+        if data:
+            yield data
+    yield stream.finish()
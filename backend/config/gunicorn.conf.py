@@ -0,0 +1,50 @@
+"""
+Production ASGI serving: gunicorn supervising uvicorn workers.
+
+    gunicorn -c config/gunicorn.conf.py config.asgi:application
+
+Under ASGI every sync view runs on one thread per worker (Django's
+thread-sensitive sync_to_async), so the hot GETs are served by
+apps.notes.async_views instead; writes still go through the sync views.
+"""
+
+import importlib.util
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "uvicorn_worker.UvicornWorker")
+# Only used by sync worker classes (e.g. gthread with config.wsgi:application).
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+# Recycle workers now and then so slow leaks cannot accumulate.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "1000"))
+accesslog = None  # RequestLogMiddleware already writes one line per request.
+
+os.environ.setdefault("NOTES_ASYNC_VIEWS", "True")
+if "uvicorn" in worker_class.lower():
+    # ASGI: no persistent connections (see DATABASES in settings); PostgreSQL
+    # deployments reuse connections through the psycopg pool instead, when
+    # psycopg[pool] is installed (it is not in requirements.txt).
+    os.environ["DB_CONN_MAX_AGE"] = "0"
+    if importlib.util.find_spec("psycopg_pool") is not None:
+        os.environ.setdefault("DB_POOL", "True")
+os.environ.setdefault("METRICS_MULTIPROCESS_DIR", "/tmp/notes-metrics")
+
+
+def on_starting(server):
+    # Counters restart with the server; drop snapshots left by a previous run.
+    from config.metrics import clear_multiprocess_dir
+
+    clear_multiprocess_dir(os.environ["METRICS_MULTIPROCESS_DIR"])
+
+
+def child_exit(server, worker):
+    # Fold the exited worker's counters into the archive and drop its file.
+    from config.metrics import archive_worker
+
+    archive_worker(os.environ["METRICS_MULTIPROCESS_DIR"], worker.pid)
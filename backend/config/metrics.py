@@ -0,0 +1,311 @@
+import atexit
+import bisect
+import hmac
+import ipaddress
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REQUESTS = "http_requests_total"
+DB_QUERIES = "http_db_queries_total"
+DURATION = "http_request_duration_seconds"
+DB_DURATION = "http_db_duration_seconds"
+LOG_DROPPED = "request_log_dropped_total"
+LOG_SAMPLED_OUT = "request_log_sampled_out_total"
+ARCHIVE = "archive.json"
+
+HELP = {
+    REQUESTS: ("counter", "Requests served, by route, method and status."),
+    DB_QUERIES: ("counter", "SQL statements executed, by route."),
+    DURATION: ("histogram", "Time spent in the middleware stack, by route and method."),
+    DB_DURATION: ("histogram", "Time spent in SQL per request, by route."),
+    LOG_DROPPED: ("counter", "Request log records dropped because the queue was full."),
+    LOG_SAMPLED_OUT: ("counter", "Successful fast requests left out of the request log."),
+}
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """
+    Counters and fixed-bucket histograms held in plain dicts. Series are keyed
+    by their rendered label string so snapshots can be merged across
+    processes without parsing.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.counters: dict[str, dict[str, float]] = {REQUESTS: {}, DB_QUERIES: {}}
+        # Per series: one count per bucket, then the +Inf count, then the sum.
+        self.histograms: dict[str, dict[str, list[float]]] = {DURATION: {}, DB_DURATION: {}}
+        self._labels: dict[tuple, tuple[str, str, str]] = {}
+        # Counters owned by other components, read at snapshot time.
+        self._sources: dict[str, Callable[[], dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def add_source(self, key: str, read: Callable[[], dict[str, float]]) -> None:
+        """
+        Include the unlabelled counters returned by read() in every snapshot.
+        Registering the same key again replaces the earlier source.
+        """
+        with self._lock:
+            self._sources[key] = read
+
+    def _label_strings(self, route: str, method: str, status: int) -> tuple[str, str, str]:
+        key = (route, method, status)
+        labels = self._labels.get(key)
+        if labels is None:
+            route_label = f'route="{_label(route)}"'
+            method_label = f'{route_label},method="{_label(method)}"'
+            labels = (f'{method_label},status="{status}"', method_label, route_label)
+            self._labels[key] = labels
+        return labels
+
+    def _observe(self, name: str, labels: str, value: float) -> None:
+        series = self.histograms[name].get(labels)
+        if series is None:
+            series = self.histograms[name][labels] = [0] * (len(self.buckets) + 2)
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def observe_request(
+        self, route: str, method: str, status: int, seconds: float, db_queries: int, db_seconds: float
+    ) -> None:
+        with self._lock:
+            status_labels, method_labels, route_labels = self._label_strings(route, method, status)
+            requests = self.counters[REQUESTS]
+            requests[status_labels] = requests.get(status_labels, 0) + 1
+            queries = self.counters[DB_QUERIES]
+            queries[route_labels] = queries.get(route_labels, 0) + db_queries
+            self._observe(DURATION, method_labels, seconds)
+            self._observe(DB_DURATION, route_labels, db_seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = {name: dict(series) for name, series in self.counters.items()}
+            for read in self._sources.values():
+                for name, value in read().items():
+                    counters[name] = {"": value}
+            return {
+                "buckets": list(self.buckets),
+                "counters": counters,
+                "histograms": {
+                    name: {labels: list(values) for labels, values in series.items()}
+                    for name, series in self.histograms.items()
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            for series in (*self.counters.values(), *self.histograms.values()):
+                series.clear()
+
+
+def merge(snapshots) -> dict:
+    merged = {"buckets": None, "counters": {}, "histograms": {}}
+    for snapshot in snapshots:
+        if merged["buckets"] is None:
+            merged["buckets"] = snapshot["buckets"]
+        elif snapshot["buckets"] != merged["buckets"]:
+            # Written by a worker with other settings; cannot be summed.
+            continue
+        for name, series in snapshot["counters"].items():
+            target = merged["counters"].setdefault(name, {})
+            for labels, value in series.items():
+                target[labels] = target.get(labels, 0) + value
+        for name, series in snapshot["histograms"].items():
+            target = merged["histograms"].setdefault(name, {})
+            for labels, values in series.items():
+                current = target.get(labels)
+                target[labels] = values if current is None else [a + b for a, b in zip(current, values)]
+    merged["buckets"] = merged["buckets"] or []
+    return merged
+
+
+def render(snapshot: dict) -> str:
+    lines = []
+    for name, series in snapshot["counters"].items():
+        kind, help_text = HELP[name]
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        lines += [
+            f"{name}{{{labels}}} {value}" if labels else f"{name} {value}"
+            for labels, value in sorted(series.items())
+        ]
+    bounds = [format(bound, "g") for bound in snapshot["buckets"]] + ["+Inf"]
+    for name, series in snapshot["histograms"].items():
+        kind, help_text = HELP[name]
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for labels, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, values[:-1]):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {values[-1]}")
+            lines.append(f"{name}_count{{{labels}}} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def _read_snapshot(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_snapshot(path: Path, snapshot: dict) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(snapshot))
+    os.replace(tmp, path)
+
+
+class MultiProcessExporter:
+    """
+    Each worker periodically writes its snapshot to
+    <directory>/<pid>-<start ns>.json from a background thread; /metrics sums
+    every file in the directory, so any worker can answer a scrape. When a
+    worker exits, archive_worker() folds its file into archive.json, so
+    counters stay monotonic without dead workers' files piling up, and a
+    reused pid never overwrites an earlier worker's totals. The directory
+    is emptied when the server starts.
+    """
+
+    def __init__(self, registry: MetricsRegistry, directory: str, interval: float):
+        self.registry = registry
+        self.directory = Path(directory)
+        self.interval = interval
+        self._pid = None
+        self._name = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    @property
+    def path(self) -> Path:
+        if self._name is None or not self._name.startswith(f"{os.getpid()}-"):
+            self._name = f"{os.getpid()}-{time.time_ns()}.json"
+        return self.directory / self._name
+
+    def ensure_started(self) -> None:
+        # Checked per request so a thread is started in each forked worker.
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self.directory.mkdir(parents=True, exist_ok=True)
+            threading.Thread(target=self._run, name="metrics-exporter", daemon=True).start()
+            atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.flush()
+
+    def flush(self) -> None:
+        _write_snapshot(self.path, self.registry.snapshot())
+
+    def collect(self) -> dict:
+        own = self.path.name
+        workers = {}
+        for path in self.directory.glob("*.json"):
+            if path.name not in (own, ARCHIVE):
+                snapshot = _read_snapshot(path)
+                if snapshot is not None:
+                    workers[path.name] = snapshot
+        # Read the archive last: a worker file that vanished above is already
+        # in it, and one that was read but has since been archived is dropped.
+        archive = _read_snapshot(self.directory / ARCHIVE)
+        snapshots = [self.registry.snapshot()]
+        if archive is not None:
+            snapshots.append(archive)
+            for name in archive.get("archived", ()):
+                workers.pop(name, None)
+        return merge([*snapshots, *workers.values()])
+
+
+def archive_worker(directory: str, pid: int) -> None:
+    """
+    Fold an exited worker's snapshot into archive.json and delete its file.
+    Called from the server's master process (gunicorn child_exit), one
+    worker at a time.
+    """
+    directory = Path(directory)
+    archive_path = directory / ARCHIVE
+    for path in directory.glob(f"{pid}-*.json"):
+        archive = _read_snapshot(archive_path)
+        snapshot = _read_snapshot(path)
+        if snapshot is not None:
+            merged = merge([archive, snapshot] if archive else [snapshot])
+            # Names stay listed only until their files are gone, so a scrape
+            # between the two steps below cannot count a worker twice.
+            merged["archived"] = [
+                name
+                for name in (archive or {}).get("archived", ())
+                if (directory / name).exists()
+            ] + [path.name]
+            _write_snapshot(archive_path, merged)
+        path.unlink(missing_ok=True)
+
+
+_registry: MetricsRegistry | None = None
+_exporter: MultiProcessExporter | None = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> MetricsRegistry:
+    global _registry, _exporter
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                config = settings.METRICS
+                registry = MetricsRegistry(config["BUCKETS"])
+                if config["MULTIPROCESS_DIR"]:
+                    _exporter = MultiProcessExporter(
+                        registry, config["MULTIPROCESS_DIR"], config["FLUSH_INTERVAL"]
+                    )
+                _registry = registry
+    return _registry
+
+
+def get_exporter() -> MultiProcessExporter | None:
+    get_registry()
+    return _exporter
+
+
+def clear_multiprocess_dir(directory: str) -> None:
+    for path in Path(directory).glob("*.json"):
+        path.unlink(missing_ok=True)
+
+
+def _allowed(request) -> bool:
+    config = settings.METRICS
+    token = config["TOKEN"]
+    if token:
+        header = request.headers.get("Authorization", "")
+        if hmac.compare_digest(header.encode(), f"Bearer {token}".encode()):
+            return True
+    try:
+        address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network) for network in config["ALLOWED_NETWORKS"]
+    )
+
+
+def metrics_view(request):
+    if not _allowed(request):
+        return HttpResponseForbidden("Forbidden\n", content_type=CONTENT_TYPE)
+    registry = get_registry()
+    exporter = get_exporter()
+    snapshot = exporter.collect() if exporter else registry.snapshot()
+    return HttpResponse(render(snapshot), content_type=CONTENT_TYPE)
@@ -1,29 +1,186 @@
-import json
+import random
 import time
 
-from django.utils.deprecation import MiddlewareMixin
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.functional import SimpleLazyObject, empty
 
+from config import compression, query_stats
+from config.metrics import LOG_DROPPED, LOG_SAMPLED_OUT, get_exporter, get_registry
+from config.request_log import get_pipeline, logger
 
-class RequestLogMiddleware(MiddlewareMixin):
-    def process_request(self, request):
-        request._start_time = time.time()
 
-    def process_response(self, request, response):
-        start_time = getattr(request, "_start_time", None)
-        latency_ms = None
-        if start_time is not None:
-            latency_ms = round((time.time() - start_time) * 1000, 2)
+def _resolved_user_id(request):
+    # Only report a user that authentication already resolved; evaluating a
+    # lazy request.user here would cost a query (and is not allowed in async
+    # context).
+    user = getattr(request, "user", None)
+    if user is None:
+        return None
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        return None
+    if getattr(user, "is_authenticated", False):
+        return user.id
+    return None
 
-        user_id = None
-        if hasattr(request, "user") and getattr(request.user, "is_authenticated", False):
-            user_id = request.user.id
+
+class RequestLogMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.pipeline = get_pipeline()
+        query_stats.install_everywhere()
+        self.metrics = get_registry() if settings.METRICS["ENABLED"] else None
+        self.exporter = get_exporter() if self.metrics else None
+        if self.metrics is not None:
+            self.metrics.add_source("request_log", self.request_log_counters)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start_ns = time.perf_counter_ns()
+        stats, token = query_stats.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            query_stats.stop(token)
+        self.log(request, response, start_ns, stats)
+        return response
+
+    async def __acall__(self, request):
+        start_ns = time.perf_counter_ns()
+        stats, token = query_stats.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            query_stats.stop(token)
+        self.log(request, response, start_ns, stats)
+        return response
+
+    def log(self, request, response, start_ns: int, stats: query_stats.QueryStats) -> None:
+        latency_ms = round((time.perf_counter_ns() - start_ns) / 1_000_000, 2)
+        config = settings.REQUEST_LOG
+
+        if self.metrics is not None:
+            self.record_metrics(request, response, latency_ms, stats)
+
+        if config["SERVER_TIMING"]:
+            response["Server-Timing"] = (
+                f'db;dur={stats.total_ms};desc="{stats.count} queries", app;dur={latency_ms}'
+            )
+
+        slow = latency_ms >= config["SLOW_REQUEST_MS"] or stats.count >= config["SLOW_QUERY_COUNT"]
+        sample_rate = config["SAMPLE_RATE"]
+        if (
+            response.status_code < 500
+            and not slow
+            and sample_rate < 1
+            and random.random() >= sample_rate
+        ):
+            self.pipeline.count_sampled_out()
+            return
 
         payload = {
             "method": request.method,
             "path": request.path,
             "status_code": response.status_code,
             "latency_ms": latency_ms,
-            "user_id": user_id,
+            "user_id": _resolved_user_id(request),
+            "db_queries": stats.count,
+            "db_ms": stats.total_ms,
+            "db_slowest": stats.slowest(config["TOP_QUERIES"]),
         }
-        print(json.dumps(payload))
+        if slow:
+            payload["slow"] = True
+            payload["db_query_log"] = stats.all()
+        logger.info(payload)
+
+    def request_log_counters(self) -> dict[str, int]:
+        stats = self.pipeline.stats()
+        return {LOG_DROPPED: stats["dropped"], LOG_SAMPLED_OUT: stats["sampled_out"]}
+
+    def record_metrics(self, request, response, latency_ms: float, stats) -> None:
+        if self.exporter is not None:
+            self.exporter.ensure_started()
+        match = getattr(request, "resolver_match", None)
+        self.metrics.observe_request(
+            route=match.view_name if match else "unmatched",
+            method=request.method,
+            status=response.status_code,
+            seconds=latency_ms / 1000,
+            db_queries=stats.count,
+            db_seconds=stats.total_ns / 1_000_000_000,
+        )
+
+
+class CompressionMiddleware:
+    """
+    Negotiated gzip / brotli / zstd for the configured API paths. Bodies
+    under MIN_SIZE are sent as-is (the framing costs more than it saves);
+    streamed responses are compressed chunk by chunk.
+
+    ETags are left untouched: they name the note or library version, not
+    the bytes, and note ETags must stay strong for If-Match on PATCH.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def compress(self, request, response):
+        config = settings.COMPRESSION
+        if (
+            not config["ENABLED"]
+            or not request.path.startswith(tuple(config["PATHS"]))
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or response.has_header("Content-Encoding")
+            or not response.get("Content-Type", "").startswith(tuple(config["CONTENT_TYPES"]))
+        ):
+            return response
+        if not response.streaming and len(response.content) < config["MIN_SIZE"]:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = compression.negotiate(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""),
+            compression.available(config["ENCODINGS"]),
+        )
+        if encoding is None:
+            return response
+        level = config["LEVELS"][encoding]
+
+        if response.streaming:
+            chunks = response.streaming_content
+            if response.is_async:
+                response.streaming_content = compression.acompress_chunks(encoding, level, chunks)
+            else:
+                response.streaming_content = compression.compress_chunks(encoding, level, chunks)
+            del response["Content-Length"]
+        else:
+            body = compression.compress(encoding, level, response.content)
+            if len(body) >= len(response.content):
+                return response
+            response.content = body
+            response["Content-Length"] = str(len(body))
+        response["Content-Encoding"] = encoding
         return response
@@ -0,0 +1,157 @@
+import difflib
+import json
+import re
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\?(?:, \?)+\)")
+_SAVEPOINT = re.compile(r'(SAVEPOINT) "[^"]+"')
+_TRANSACTION = re.compile(r"^(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE SAVEPOINT)\b", re.IGNORECASE)
+# Django logs executemany() as "N times: <sql>" without the parameters.
+_EXECUTEMANY = re.compile(r"^\d+ times: ")
+
+
+def normalize(sql: str) -> str:
+    """
+    Strip literal values so a statement compares equal across runs: ids,
+    timestamps and tokens differ, the shape of the query does not.
+    """
+    sql = _NUMBER.sub("?", _STRING.sub("?", _SAVEPOINT.sub(r"\1 ?", sql)))
+    return _IN_LIST.sub("(...)", sql)
+
+
+def duplicates(statements: list[str]) -> list[str]:
+    """
+    Statements issued more than once with identical parameters (an N+1 or a
+    forgotten select_related, not two updates of different rows).
+    """
+    counts = Counter(
+        sql for sql in statements if not (_TRANSACTION.match(sql) or _EXECUTEMANY.match(sql))
+    )
+    return [sql for sql, count in counts.items() if count > 1]
+
+
+def endpoint(response, scenario: str | None = None) -> str:
+    """
+    The baseline key of a call: method, route and status code, plus the
+    scenario label the test put it under, e.g.
+    "PATCH /api/notes/<int:note_id> 200 [no-op autosave]".
+    """
+    method = response.request["REQUEST_METHOD"]
+    match = response.resolver_match
+    path = f"/{match.route}" if match else response.request["PATH_INFO"]
+    key = f"{method} {path} {response.status_code}"
+    return f"{key} [{scenario}]" if scenario else key
+
+
+def counted(statements: list[str]) -> list[str]:
+    """
+    Statements that count against a budget: transaction control (BEGIN,
+    savepoints) varies with the backend and the test's own atomic blocks.
+    """
+    return [sql for sql in statements if not _TRANSACTION.match(sql)]
+
+
+class QueryBaseline:
+    """
+    Committed query baselines, one per endpoint, status and scenario:
+
+        {"<key>": {"queries": <budget>, "sql": [<normalized sql>, ...]}}
+
+    The budget and SQL come from the costliest call recorded under the key,
+    so renaming or reordering tests changes nothing. Paths with different
+    costs (a cold or warm cache, a no-op or a real edit) belong under
+    different scenario labels; otherwise the cheap path inherits the budget
+    of the expensive one.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: dict[str, dict] = json.loads(path.read_text()) if path.exists() else {}
+        self.recorded: dict[str, dict] = {}
+
+    def expected(self, key: str) -> dict | None:
+        return self.entries.get(key)
+
+    def record(self, key: str, queries: list[str]) -> None:
+        current = self.recorded.get(key)
+        if current is None or len(queries) > current["queries"]:
+            self.recorded[key] = {"queries": len(queries), "sql": queries}
+
+    def save(self, partial: bool = False) -> None:
+        """
+        Replace the keys that ran; keys no test reached are kept. A partial
+        run (`-k`, a single test) may not reach a key's costliest call, so
+        it only raises budgets and never lowers them.
+        """
+        merged = dict(self.entries)
+        for key, entry in self.recorded.items():
+            current = merged.get(key)
+            if not (partial and current and current["queries"] >= entry["queries"]):
+                merged[key] = entry
+        self.path.write_text(json.dumps(dict(sorted(merged.items())), indent=2) + "\n")
+
+
+def check(key: str, expected: dict | None, executed: list[str]) -> None:
+    queries = [normalize(sql) for sql in counted(executed)]
+    problems = []
+    if expected is None:
+        problems.append("no baseline recorded for this call")
+    elif len(queries) > expected["queries"]:
+        problems.append(f"query count rose from {expected['queries']} to {len(queries)}")
+    repeated = duplicates(executed)
+    if repeated:
+        problems.append(f"{len(repeated)} duplicate quer{'y' if len(repeated) == 1 else 'ies'}")
+    if not problems:
+        return
+
+    lines = [f"{key}: " + "; ".join(problems)]
+    if expected is not None:
+        lines += difflib.unified_diff(expected["sql"], queries, "baseline", "current", lineterm="")
+    else:
+        lines += [f"  {sql}" for sql in queries]
+    for sql in repeated:
+        lines.append(f"duplicate: {sql}")
+    lines.append("If the change is intended, rerun with --update-query-baselines.")
+    raise AssertionError("\n".join(lines))
+
+
+class QueryGuard:
+    """
+    Wraps a test client's request() so every API call is captured and
+    checked against (or, when updating, recorded into) the baseline.
+    """
+
+    def __init__(self, baseline: QueryBaseline, label: str | None, update: bool):
+        self.baseline = baseline
+        self.label = label
+        self.update = update
+
+    @contextmanager
+    def scenario(self, label: str):
+        """Key the calls made inside the block under their own scenario."""
+        previous, self.label = self.label, label
+        try:
+            yield
+        finally:
+            self.label = previous
+
+    def wrap(self, request):
+        def guarded(client, **kwargs):
+            with CaptureQueriesContext(connection) as context:
+                response = request(client, **kwargs)
+            executed = [query["sql"] for query in context.captured_queries]
+            key = endpoint(response, self.label)
+            if self.update:
+                self.baseline.record(key, [normalize(sql) for sql in counted(executed)])
+            else:
+                check(key, self.baseline.expected(key), executed)
+            return response
+
+        return guarded
@@ -0,0 +1,83 @@
+import heapq
+import time
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+MAX_RECORDED_QUERIES = 1000
+MAX_SQL_LENGTH = 500
+
+_current: ContextVar["QueryStats | None"] = ContextVar("request_query_stats", default=None)
+
+
+class QueryStats:
+    """
+    Per-request SQL accounting: count, total time, and the statements
+    themselves (parameter placeholders only, never the values).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.queries: list[tuple[int, str]] = []
+
+    def record(self, sql: str, duration_ns: int) -> None:
+        self.count += 1
+        self.total_ns += duration_ns
+        if len(self.queries) < MAX_RECORDED_QUERIES:
+            self.queries.append((duration_ns, sql))
+
+    @property
+    def total_ms(self) -> float:
+        return round(self.total_ns / 1_000_000, 2)
+
+    @staticmethod
+    def _entry(duration_ns: int, sql: str) -> dict:
+        return {"ms": round(duration_ns / 1_000_000, 2), "sql": sql[:MAX_SQL_LENGTH]}
+
+    def slowest(self, n: int) -> list[dict]:
+        return [self._entry(*query) for query in heapq.nlargest(n, self.queries, key=lambda q: q[0])]
+
+    def all(self) -> list[dict]:
+        return [self._entry(*query) for query in self.queries]
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start_ns = time.perf_counter_ns()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.record(sql, time.perf_counter_ns() - start_ns)
+
+
+def install(connection) -> None:
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    install(connection)
+
+
+def install_everywhere() -> None:
+    """
+    Attach the collector to every database connection. The wrapper reads the
+    active collector from a ContextVar, so it follows a request into
+    sync_to_async threads and is a no-op outside requests.
+    """
+    connection_created.connect(_on_connection_created, dispatch_uid="config.query_stats")
+    for connection in connections.all(initialized_only=True):
+        install(connection)
+
+
+def start() -> tuple[QueryStats, object]:
+    stats = QueryStats()
+    return stats, _current.set(stats)
+
+
+def stop(token) -> None:
+    _current.reset(token)
@@ -0,0 +1,91 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+from django.conf import settings
+
+logger = logging.getLogger("config.request_log")
+
+
+class JsonPayloadFormatter(logging.Formatter):
+    def format(self, record):
+        if isinstance(record.msg, dict):
+            return json.dumps(record.msg)
+        return super().format(record)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Hand records to a bounded queue without blocking the request thread.
+    When the queue is full the record is dropped and counted.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record):
+        # Formatting (json.dumps) happens on the listener thread.
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+
+class RequestLogPipeline:
+    def __init__(self, queue_size: int, stream=None):
+        self.handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        self.output = logging.StreamHandler(stream or sys.stdout)
+        self.output.setFormatter(JsonPayloadFormatter())
+        self.listener = QueueListener(self.handler.queue, self.output)
+        self.sampled_out = 0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        self.listener.start()
+
+    def stop(self) -> None:
+        # Drains whatever is still queued before returning, then reports
+        # what never reached the log (also exported on /metrics).
+        if self.listener._thread is not None:
+            self.listener.stop()
+            stats = self.stats()
+            if any(stats.values()):
+                self.output.handle(
+                    logging.makeLogRecord({"msg": {"event": "request_log_stats", **stats}})
+                )
+
+    def count_sampled_out(self) -> None:
+        with self._lock:
+            self.sampled_out += 1
+
+    def stats(self) -> dict:
+        return {"dropped": self.handler.dropped, "sampled_out": self.sampled_out}
+
+
+_pipeline: RequestLogPipeline | None = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline() -> RequestLogPipeline:
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                pipeline = RequestLogPipeline(settings.REQUEST_LOG["QUEUE_SIZE"])
+                logger.addHandler(pipeline.handler)
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                pipeline.start()
+                atexit.register(pipeline.stop)
+                _pipeline = pipeline
+    return _pipeline
@@ -23,6 +23,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "config.middleware.CompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -62,9 +63,72 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD", ""),
         "HOST": os.getenv("DB_HOST", ""),
         "PORT": os.getenv("DB_PORT", ""),
+        # Persistent connections are opt-in and for WSGI only: set
+        # DB_CONN_MAX_AGE to reuse a connection across requests on the same
+        # thread. Under ASGI each request's sync work may land on a new
+        # thread, so persistent connections pile up until the server runs
+        # out; use DB_POOL there instead. Health checks replace a connection
+        # that died while it sat idle.
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "0")),
+        "CONN_HEALTH_CHECKS": os.getenv("DB_CONN_HEALTH_CHECKS", "True") == "True",
+        "OPTIONS": {},
     }
 }
 
+# SQLite: WAL lets readers run alongside the single writer, and BEGIN
+# IMMEDIATE takes the write lock when a transaction opens, so concurrent
+# writers wait on busy_timeout instead of failing with "database is locked"
+# when a read transaction tries to upgrade.
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(128 * 1024 * 1024))),
+    # Negative values are KiB: about 20 MB of page cache per connection.
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-20000")),
+    "temp_store": "MEMORY",
+}
+
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["default"]["OPTIONS"].update(
+        {
+            "init_command": ";".join(
+                f"PRAGMA {name}={value}" for name, value in SQLITE_PRAGMAS.items()
+            ),
+            "transaction_mode": os.getenv("SQLITE_TRANSACTION_MODE", "IMMEDIATE"),
+        }
+    )
+
+# Native psycopg 3 pool (PostgreSQL only, needs psycopg[pool]); the way to
+# reuse connections under ASGI. A pool owns its connections, so persistent
+# connections are switched off with it.
+if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql" and (
+    os.getenv("DB_POOL", "False") == "True"
+):
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+    }
+
+# The first hasher hashes new passwords; the rest still verify existing
+# hashes, which are upgraded on the next successful login. argon2 and bcrypt
+# need argon2-cffi / bcrypt installed.
+PASSWORD_HASHER_CHOICES = {
+    "pbkdf2": "apps.users.hashers.PBKDF2PasswordHasher",
+    "scrypt": "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "argon2": "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "bcrypt": "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+}
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "pbkdf2")
+PASSWORD_HASHERS = [PASSWORD_HASHER_CHOICES[PASSWORD_HASHER]] + [
+    path for name, path in PASSWORD_HASHER_CHOICES.items() if name != PASSWORD_HASHER
+]
+# 0 keeps Django's default for the installed version.
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", "0"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -80,6 +144,55 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Request log lines are queued and written by a background thread. Lines for
+# non-5xx responses can be sampled; overflow is dropped and counted.
+REQUEST_LOG = {
+    "SAMPLE_RATE": float(os.getenv("REQUEST_LOG_SAMPLE_RATE", "1.0")),
+    "QUEUE_SIZE": int(os.getenv("REQUEST_LOG_QUEUE_SIZE", "10000")),
+    # Requests at or over either threshold are always logged, with every
+    # statement they ran.
+    "SLOW_REQUEST_MS": float(os.getenv("REQUEST_LOG_SLOW_REQUEST_MS", "500")),
+    "SLOW_QUERY_COUNT": int(os.getenv("REQUEST_LOG_SLOW_QUERY_COUNT", "50")),
+    "TOP_QUERIES": int(os.getenv("REQUEST_LOG_TOP_QUERIES", "3")),
+    "SERVER_TIMING": os.getenv("REQUEST_LOG_SERVER_TIMING", "True") == "True",
+}
+
+METRICS = {
+    "ENABLED": os.getenv("METRICS_ENABLED", "True") == "True",
+    # Shared by all workers of one server; set it when running more than one
+    # process so /metrics reports the whole server rather than one worker.
+    "MULTIPROCESS_DIR": os.getenv("METRICS_MULTIPROCESS_DIR", ""),
+    "FLUSH_INTERVAL": float(os.getenv("METRICS_FLUSH_INTERVAL", "5")),
+    "BUCKETS": (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    # /metrics answers requests from these networks, or carrying
+    # "Authorization: Bearer <TOKEN>" when a token is set. Behind a reverse
+    # proxy REMOTE_ADDR is the proxy, so prefer the token there.
+    "ALLOWED_NETWORKS": [
+        network.strip()
+        for network in os.getenv("METRICS_ALLOWED_NETWORKS", "127.0.0.1/32,::1/128").split(",")
+        if network.strip()
+    ],
+    "TOKEN": os.getenv("METRICS_TOKEN", ""),
+}
+
+# Response compression for note payloads. ENCODINGS is the server's
+# preference among codings the client weights equally; br and zstd are used
+# only when the brotli / zstandard packages are installed.
+COMPRESSION = {
+    "ENABLED": os.getenv("COMPRESSION_ENABLED", "True") == "True",
+    "ENCODINGS": [
+        name.strip() for name in os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",")
+    ],
+    "MIN_SIZE": int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+    "PATHS": ("/api/notes",),
+    "CONTENT_TYPES": ("application/json", "application/x-ndjson", "text/"),
+    "LEVELS": {
+        "gzip": int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+        "br": int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4")),
+        "zstd": int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3")),
+    },
+}
+
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "UTC"
 USE_I18N = True
@@ -92,9 +205,45 @@ AUTH_USER_MODEL = "users.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    "DEFAULT_RENDERER_CLASSES": (
+        "config.renderers.CompactJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+}
+
+# Users resolved from access tokens, cached per process by (user id, iat).
+# Invalidation is process-local: after a user is deactivated or changes
+# password, other workers accept their tokens for up to TTL seconds, so keep
+# it short. Set TTL to 0 to load the user on every request.
+AUTH_USER_CACHE = {
+    "MAX_ENTRIES": int(os.getenv("AUTH_USER_CACHE_MAX_ENTRIES", "10000")),
+    "TTL": float(os.getenv("AUTH_USER_CACHE_TTL", "10")),
+}
+
+NOTES_PAGE_SIZE = int(os.getenv("NOTES_PAGE_SIZE", "50"))
+NOTES_MAX_PAGE_SIZE = int(os.getenv("NOTES_MAX_PAGE_SIZE", "200"))
+NOTES_PREVIEW_LENGTH = int(os.getenv("NOTES_PREVIEW_LENGTH", "200"))
+NOTES_BATCH_MAX_SIZE = int(os.getenv("NOTES_BATCH_MAX_SIZE", "500"))
+NOTES_EXPORT_CHUNK_SIZE = int(os.getenv("NOTES_EXPORT_CHUNK_SIZE", "500"))
+NOTES_IMPORT_BATCH_SIZE = int(os.getenv("NOTES_IMPORT_BATCH_SIZE", "500"))
+# Deletions are kept this long for delta sync; prune_note_tombstones removes
+# older ones, and clients whose token predates them get 410 and resync.
+NOTES_TOMBSTONE_RETENTION = os.getenv("NOTES_TOMBSTONE_RETENTION", "30d")
+# Render the full notes list with apps.notes.fast_serializers instead of DRF.
+NOTES_FAST_SERIALIZATION = os.getenv("NOTES_FAST_SERIALIZATION", "True") == "True"
+# Route GETs on the notes list, detail and summary to apps.notes.async_views.
+# Only worth it under an ASGI server (config/gunicorn.conf.py turns it on).
+NOTES_ASYNC_VIEWS = os.getenv("NOTES_ASYNC_VIEWS", "False") == "True"
+
+# Per-user category lookups: a process-local LRU in front of an optional
+# shared Django cache (set BACKEND to a CACHES alias to enable it).
+NOTES_CATEGORY_CACHE = {
+    "MAX_USERS": int(os.getenv("NOTES_CATEGORY_CACHE_MAX_USERS", "1024")),
+    "TTL": float(os.getenv("NOTES_CATEGORY_CACHE_TTL", "300")),
+    "BACKEND": os.getenv("NOTES_CATEGORY_CACHE_BACKEND") or None,
 }
 
 CORS_ALLOWED_ORIGINS = [
@@ -102,3 +251,6 @@ CORS_ALLOWED_ORIGINS = [
     for origin in os.getenv("CORS_ALLOWED_ORIGINS", "http://localhost:3000").split(",")
     if origin.strip()
 ]
+
+# Lets the editor read a note's ETag and send it back as If-Match.
+CORS_EXPOSE_HEADERS = ["ETag"]
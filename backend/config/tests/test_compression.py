@@ -0,0 +1,95 @@
+import gzip
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.conf import settings
+from django.test import override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.notes.models import Category, Note
+from apps.users.models import User
+from config.compression import negotiate
+from config.renderers import CompactJSONRenderer
+
+
+def test_negotiate_honours_q_values_then_server_preference():
+    assert negotiate("gzip, deflate, br", ["zstd", "br", "gzip"]) == "br"
+    assert negotiate("gzip;q=1.0, br;q=0.5", ["br", "gzip"]) == "gzip"
+    assert negotiate("*", ["br", "gzip"]) == "br"
+    assert negotiate("br;q=0, *;q=0.1", ["br", "gzip"]) == "gzip"
+    assert negotiate("identity", ["br", "gzip"]) is None
+    assert negotiate("", ["gzip"]) is None
+
+
+def test_compact_renderer_matches_drf_output():
+    data = {
+        "detail": gettext_lazy("Not found."),
+        "at": datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+        "amount": Decimal("1.50"),
+        "text": "café   line",
+        "items": [1, 2.5, None, True],
+        1: "int key",
+    }
+    assert CompactJSONRenderer().render(data) == JSONRenderer().render(data)
+    assert CompactJSONRenderer().render(None) == b""
+
+    floats = {"rank": -1.23e-06, "big": 1e16}
+    assert json.loads(CompactJSONRenderer().render(floats)) == floats
+
+
+def test_compact_renderer_falls_back_to_stdlib_without_orjson(monkeypatch):
+    monkeypatch.setattr("config.renderers.orjson", None)
+    data = {"text": "café", "rank": -1.23e-06, "at": datetime(2024, 1, 2, tzinfo=timezone.utc)}
+
+    assert CompactJSONRenderer().render(data) == JSONRenderer().render(data)
+    assert CompactJSONRenderer().render(data) == (
+        b'{"text":"caf\xc3\xa9","rank":-1.23e-06,"at":"2024-01-02T00:00:00Z"}'
+    )
+
+
+@pytest.fixture
+def notes_client(db):
+    user = User.objects.create_user(email="gzip@example.com", password="StrongPass123")
+    category = Category.objects.create(user=user, name="School", color_hex="#000000")
+    Note.objects.bulk_create(
+        Note(user=user, category=category, title=f"Note {i}", content="Lorem ipsum dolor. " * 20)
+        for i in range(20)
+    )
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+    return client
+
+
+def test_notes_list_is_gzipped_when_accepted(notes_client):
+    plain = notes_client.get("/api/notes")
+    response = notes_client.get("/api/notes", HTTP_ACCEPT_ENCODING="gzip")
+
+    assert "Content-Encoding" not in plain
+    assert response["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response["Vary"]
+    assert int(response["Content-Length"]) == len(response.content) < len(plain.content)
+    assert gzip.decompress(response.content) == plain.content
+
+
+def test_small_and_unlisted_responses_are_not_compressed(notes_client):
+    with override_settings(COMPRESSION={**settings.COMPRESSION, "MIN_SIZE": 10**6}):
+        response = notes_client.get("/api/notes", HTTP_ACCEPT_ENCODING="gzip")
+    assert "Content-Encoding" not in response
+
+    response = notes_client.get("/api/auth/me", HTTP_ACCEPT_ENCODING="gzip")
+    assert "Content-Encoding" not in response
+
+
+def test_export_stream_is_compressed_chunk_by_chunk(notes_client):
+    response = notes_client.get("/api/notes/export", HTTP_ACCEPT_ENCODING="gzip")
+
+    assert response["Content-Encoding"] == "gzip"
+    assert not response.has_header("Content-Length")
+    lines = gzip.decompress(b"".join(response.streaming_content)).splitlines()
+    assert sum(json.loads(line)["type"] == "note" for line in lines) == 20
+
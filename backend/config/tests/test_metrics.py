@@ -0,0 +1,130 @@
+import os
+
+import pytest
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+
+from config.metrics import (
+    DURATION,
+    LOG_DROPPED,
+    LOG_SAMPLED_OUT,
+    REQUESTS,
+    MetricsRegistry,
+    MultiProcessExporter,
+    archive_worker,
+    get_registry,
+    merge,
+    render,
+)
+
+
+@pytest.fixture
+def registry():
+    registry = get_registry()
+    registry.reset()
+    yield registry
+    registry.reset()
+
+
+def test_histogram_buckets_are_cumulative_in_text_format():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.1, 0.5, 3.0):
+        registry.observe_request("notes", "GET", 200, seconds, db_queries=2, db_seconds=0.001)
+
+    text = render(registry.snapshot())
+
+    assert '# TYPE http_request_duration_seconds histogram' in text
+    assert 'http_request_duration_seconds_bucket{route="notes",method="GET",le="0.1"} 2' in text
+    assert 'http_request_duration_seconds_bucket{route="notes",method="GET",le="1"} 3' in text
+    assert 'http_request_duration_seconds_bucket{route="notes",method="GET",le="+Inf"} 4' in text
+    assert 'http_request_duration_seconds_count{route="notes",method="GET"} 4' in text
+    assert 'http_requests_total{route="notes",method="GET",status="200"} 4' in text
+    assert 'http_db_queries_total{route="notes"} 8' in text
+
+
+def test_snapshots_from_several_workers_are_summed(tmp_path):
+    first = MetricsRegistry(buckets=(0.1,))
+    second = MetricsRegistry(buckets=(0.1,))
+    first.observe_request("login", "POST", 200, 0.05, 1, 0.0)
+    second.observe_request("login", "POST", 200, 0.5, 1, 0.0)
+    second.observe_request("login", "POST", 401, 0.01, 1, 0.0)
+
+    MultiProcessExporter(second, tmp_path, interval=60).flush()
+    other = tmp_path / "other.json"
+    next(tmp_path.glob("*.json")).rename(other)
+
+    merged = MultiProcessExporter(first, tmp_path, interval=60).collect()
+
+    assert merged["counters"][REQUESTS] == {
+        'route="login",method="POST",status="200"': 2,
+        'route="login",method="POST",status="401"': 1,
+    }
+    assert merged["histograms"][DURATION]['route="login",method="POST"'][:2] == [2, 1]
+
+
+def test_exited_workers_are_archived_and_counters_never_drop(tmp_path):
+    exited = MetricsRegistry(buckets=(0.1,))
+    exited.observe_request("login", "POST", 200, 0.05, 1, 0.0)
+    exited.observe_request("login", "POST", 200, 0.05, 1, 0.0)
+    MultiProcessExporter(exited, tmp_path, interval=60).flush()
+    archive_worker(tmp_path, os.getpid())
+
+    # A later worker that reuses the pid gets a file of its own.
+    reused = MetricsRegistry(buckets=(0.1,))
+    reused.observe_request("login", "POST", 200, 0.05, 1, 0.0)
+    MultiProcessExporter(reused, tmp_path, interval=60).flush()
+
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    merged = MultiProcessExporter(MetricsRegistry(buckets=(0.1,)), tmp_path, interval=60).collect()
+    assert merged["counters"][REQUESTS] == {'route="login",method="POST",status="200"': 3}
+
+
+def test_source_counters_are_rendered_without_labels():
+    registry = MetricsRegistry(buckets=(0.1,))
+    registry.add_source("request_log", lambda: {LOG_DROPPED: 2, LOG_SAMPLED_OUT: 5})
+
+    text = render(merge([registry.snapshot(), registry.snapshot()]))
+
+    assert "# TYPE request_log_dropped_total counter" in text
+    assert "\nrequest_log_dropped_total 4\n" in text
+    assert "\nrequest_log_sampled_out_total 10\n" in text
+
+
+def test_merge_skips_snapshots_with_other_buckets():
+    a = MetricsRegistry(buckets=(0.1,))
+    b = MetricsRegistry(buckets=(0.2,))
+    a.observe_request("me", "GET", 200, 0.01, 0, 0.0)
+    b.observe_request("me", "GET", 200, 0.01, 0, 0.0)
+
+    merged = merge([a.snapshot(), b.snapshot()])
+
+    assert merged["counters"][REQUESTS]['route="me",method="GET",status="200"'] == 1
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_reports_requests_by_url_name(client, registry):
+    client.get(reverse("notes-summary"))
+    client.get("/no-such-page")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    text = response.content.decode()
+    assert 'http_requests_total{route="notes-summary",method="GET",status="401"} 1' in text
+    assert 'http_requests_total{route="unmatched",method="GET",status="404"} 1' in text
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_requires_internal_address_or_token(client, registry):
+    assert client.get("/metrics", REMOTE_ADDR="203.0.113.7").status_code == 403
+
+    with override_settings(METRICS={**settings.METRICS, "TOKEN": "s3cret"}):
+        wrong = client.get("/metrics", REMOTE_ADDR="203.0.113.7", HTTP_AUTHORIZATION="Bearer x")
+        right = client.get(
+            "/metrics", REMOTE_ADDR="203.0.113.7", HTTP_AUTHORIZATION="Bearer s3cret"
+        )
+
+    assert wrong.status_code == 403
+    assert right.status_code == 200
@@ -0,0 +1,96 @@
+import pytest
+
+from config.query_baseline import (
+    QueryBaseline,
+    QueryGuard,
+    check,
+    counted,
+    duplicates,
+    normalize,
+)
+
+SELECT_NOTE = 'SELECT "notes_note"."id" FROM "notes_note" WHERE "notes_note"."id" = {} LIMIT 21'
+
+
+def test_normalize_strips_literals_and_savepoint_names():
+    assert normalize(SELECT_NOTE.format(7)) == normalize(SELECT_NOTE.format(12))
+    assert normalize("SELECT 1 FROM t WHERE c = 'it''s' AND id IN (1, 2, 3)") == (
+        "SELECT ? FROM t WHERE c = ? AND id IN (...)"
+    )
+    assert normalize('RELEASE SAVEPOINT "s1400_x12"') == "RELEASE SAVEPOINT ?"
+
+
+def test_duplicates_need_identical_parameters():
+    statements = [
+        SELECT_NOTE.format(1),
+        SELECT_NOTE.format(2),
+        SELECT_NOTE.format(1),
+        "2 times: INSERT INTO notes_note_fts VALUES (%s)",
+        "2 times: INSERT INTO notes_note_fts VALUES (%s)",
+        'SAVEPOINT "s1_x1"',
+        'SAVEPOINT "s1_x1"',
+    ]
+    assert duplicates(statements) == [SELECT_NOTE.format(1)]
+
+
+def test_check_reports_a_count_increase_as_an_sql_diff():
+    expected = {"queries": 1, "sql": [normalize(SELECT_NOTE.format(1))]}
+    check("GET /api/notes 200", expected, ['SAVEPOINT "s1_x1"', SELECT_NOTE.format(5)])
+
+    with pytest.raises(AssertionError) as excinfo:
+        check(
+            "GET /api/notes 200",
+            expected,
+            [SELECT_NOTE.format(5), 'SELECT "notes_category"."id" FROM "notes_category"'],
+        )
+    message = str(excinfo.value)
+    assert "GET /api/notes 200: query count rose from 1 to 2" in message
+    assert '+SELECT "notes_category"."id" FROM "notes_category"' in message
+
+    with pytest.raises(AssertionError, match="no baseline recorded"):
+        check("GET /api/other 200", None, [])
+    with pytest.raises(AssertionError, match="1 duplicate query"):
+        check("GET /api/notes 200", {"queries": 2, "sql": []}, [SELECT_NOTE.format(5)] * 2)
+
+
+def test_scenarios_are_recorded_and_saved_separately(tmp_path):
+    path = tmp_path / "baselines.json"
+    baseline = QueryBaseline(path)
+    guard = QueryGuard(baseline, None, update=True)
+    baseline.record("GET /api/notes/summary 200", ["SELECT ?"])
+    baseline.record("PATCH /api/notes/<int:note_id> 200", ["SELECT ?", "UPDATE ?"])
+    baseline.record("PATCH /api/notes/<int:note_id> 200", ["SELECT ?"])
+    with guard.scenario("no-op autosave"):
+        assert guard.label == "no-op autosave"
+    assert guard.label is None
+    baseline.save()
+
+    rerun = QueryBaseline(path)
+    rerun.record("PATCH /api/notes/<int:note_id> 200 [no-op autosave]", ["SELECT ?"])
+    rerun.save()
+
+    saved = QueryBaseline(path)
+    assert saved.expected("PATCH /api/notes/<int:note_id> 200")["queries"] == 2
+    assert saved.expected("PATCH /api/notes/<int:note_id> 200 [no-op autosave]") == {
+        "queries": 1,
+        "sql": ["SELECT ?"],
+    }
+    assert saved.expected("GET /api/notes/summary 200")["sql"] == ["SELECT ?"]
+    assert counted(['SAVEPOINT "s1_x1"', "SELECT 1", 'RELEASE SAVEPOINT "s1_x1"']) == ["SELECT 1"]
+
+
+def test_partial_runs_only_raise_budgets(tmp_path):
+    path = tmp_path / "baselines.json"
+    baseline = QueryBaseline(path)
+    baseline.record("POST /api/notes/batch 200", ["SELECT ?", "INSERT ?"])
+    baseline.save()
+
+    subset = QueryBaseline(path)
+    subset.record("POST /api/notes/batch 200", ["SELECT ?"])
+    subset.save(partial=True)
+    assert QueryBaseline(path).expected("POST /api/notes/batch 200")["queries"] == 2
+
+    full = QueryBaseline(path)
+    full.record("POST /api/notes/batch 200", ["SELECT ?"])
+    full.save()
+    assert QueryBaseline(path).expected("POST /api/notes/batch 200")["queries"] == 1
@@ -0,0 +1,148 @@
+import asyncio
+import io
+import json
+import logging
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from config.metrics import LOG_DROPPED, LOG_SAMPLED_OUT, get_registry
+from config.middleware import RequestLogMiddleware
+from config.request_log import RequestLogPipeline, logger
+
+
+@pytest.fixture
+def captured_log():
+    # Route the logger through a private pipeline writing to a buffer.
+    stream = io.StringIO()
+    pipeline = RequestLogPipeline(queue_size=100, stream=stream)
+    saved_handlers = logger.handlers[:]
+    logger.handlers = [pipeline.handler]
+    pipeline.start()
+    yield pipeline, stream
+    pipeline.stop()
+    logger.handlers = saved_handlers
+
+
+def _lines(pipeline, stream):
+    pipeline.stop()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_sync_request_is_logged_from_the_queue(captured_log):
+    pipeline, stream = captured_log
+    middleware = RequestLogMiddleware(lambda request: HttpResponse(status=201))
+    middleware.pipeline = pipeline
+
+    middleware(RequestFactory().post("/api/notes"))
+
+    [line] = _lines(pipeline, stream)
+    assert line["method"] == "POST"
+    assert line["path"] == "/api/notes"
+    assert line["status_code"] == 201
+    assert line["latency_ms"] >= 0
+    assert line["user_id"] is None
+
+
+def test_async_request_is_logged_without_sync_hop(captured_log):
+    pipeline, stream = captured_log
+
+    async def get_response(request):
+        return HttpResponse(status=204)
+
+    middleware = RequestLogMiddleware(get_response)
+    middleware.pipeline = pipeline
+    assert asyncio.iscoroutinefunction(middleware)
+
+    response = asyncio.run(middleware(RequestFactory().get("/api/notes/1")))
+    assert response.status_code == 204
+    assert _lines(pipeline, stream)[0]["status_code"] == 204
+
+
+def test_sampling_skips_successful_requests_but_keeps_errors(captured_log, settings):
+    pipeline, stream = captured_log
+    settings.REQUEST_LOG = {**settings.REQUEST_LOG, "SAMPLE_RATE": 0.0}
+    ok = RequestLogMiddleware(lambda request: HttpResponse(status=200))
+    failing = RequestLogMiddleware(lambda request: HttpResponse(status=500))
+    ok.pipeline = failing.pipeline = pipeline
+
+    ok(RequestFactory().get("/api/notes"))
+    failing(RequestFactory().get("/api/notes"))
+
+    *lines, summary = _lines(pipeline, stream)
+    assert [line["status_code"] for line in lines] == [500]
+    assert summary == {"event": "request_log_stats", "dropped": 0, "sampled_out": 1}
+    counters = get_registry().snapshot()["counters"]
+    assert counters[LOG_SAMPLED_OUT] == {"": 1}
+    assert counters[LOG_DROPPED] == {"": 0}
+
+
+def test_full_queue_drops_and_counts():
+    pipeline = RequestLogPipeline(queue_size=1, stream=io.StringIO())
+    record = logging.makeLogRecord({"msg": {"path": "/"}})
+
+    pipeline.handler.handle(record)
+    pipeline.handler.handle(record)
+
+    assert pipeline.stats()["dropped"] == 1
+
+
+@pytest.mark.django_db
+def test_query_stats_are_logged_and_sent_as_server_timing(captured_log):
+    from django.contrib.auth import get_user_model
+
+    pipeline, stream = captured_log
+
+    def view(request):
+        get_user_model().objects.count()
+        get_user_model().objects.filter(email="a@example.com").exists()
+        return HttpResponse()
+
+    middleware = RequestLogMiddleware(view)
+    middleware.pipeline = pipeline
+    response = middleware(RequestFactory().get("/api/notes/summary"))
+
+    [line] = _lines(pipeline, stream)
+    assert line["db_queries"] == 2
+    assert line["db_ms"] >= 0
+    assert len(line["db_slowest"]) == 2
+    assert all("SELECT" in query["sql"] for query in line["db_slowest"])
+    assert "db_query_log" not in line
+    assert response["Server-Timing"].startswith("db;dur=")
+    assert 'desc="2 queries"' in response["Server-Timing"]
+
+
+@pytest.mark.django_db
+def test_slow_requests_log_every_query_even_when_sampled_out(captured_log, settings):
+    from django.contrib.auth import get_user_model
+
+    pipeline, stream = captured_log
+    settings.REQUEST_LOG = {**settings.REQUEST_LOG, "SAMPLE_RATE": 0.0, "SLOW_QUERY_COUNT": 3}
+
+    def view(request):
+        for _ in range(3):
+            get_user_model().objects.count()
+        return HttpResponse()
+
+    middleware = RequestLogMiddleware(view)
+    middleware.pipeline = pipeline
+    middleware(RequestFactory().get("/api/notes"))
+
+    [line] = _lines(pipeline, stream)
+    assert line["slow"] is True
+    assert len(line["db_query_log"]) == 3
+    assert len(line["db_slowest"]) == 3
+
+
+@pytest.mark.django_db
+def test_queries_outside_requests_are_not_collected():
+    from django.contrib.auth import get_user_model
+
+    from config import query_stats
+
+    query_stats.install_everywhere()
+    stats, token = query_stats.start()
+    query_stats.stop(token)
+    get_user_model().objects.count()
+    assert stats.count == 0
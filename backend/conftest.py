@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import pytest
+from rest_framework.test import APIClient
+
+from apps.notes.cache import clear_category_cache
+from apps.users.authentication import clear_user_cache
+from config.query_baseline import QueryBaseline, QueryGuard
+
+QUERY_BASELINE_PATH = Path(__file__).resolve().parent / "query_baselines.json"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-query-baselines",
+        action="store_true",
+        help=f"Rewrite {QUERY_BASELINE_PATH.name} from the queries the guarded tests issue.",
+    )
+
+
+def pytest_deselected(items):
+    if items:
+        items[0].config._query_baseline_partial = True
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    baseline = getattr(config, "_query_baseline", None)
+    if baseline is not None and config.getoption("--update-query-baselines"):
+        partial = getattr(config, "_query_baseline_partial", False) or any(
+            "::" in arg for arg in config.args
+        )
+        baseline.save(partial=partial)
+
+
+@pytest.fixture(autouse=True)
+def _isolate_process_caches():
+    # Test databases are rolled back between tests and primary keys get
+    # reused, so process-local caches must not leak across tests.
+    clear_category_cache()
+    clear_user_cache()
+    yield
+    clear_category_cache()
+    clear_user_cache()
+
+
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix, tmp_path_factory):
+    # Test against an SQLite file rather than Django's shared-cache in-memory
+    # database, so WAL, busy_timeout and BEGIN IMMEDIATE behave as deployed.
+    from django.conf import settings
+
+    database = settings.DATABASES["default"]
+    if database["ENGINE"] == "django.db.backends.sqlite3" and not database.get("TEST", {}).get(
+        "NAME"
+    ):
+        database.setdefault("TEST", {})["NAME"] = str(tmp_path_factory.mktemp("db") / "test.sqlite3")
+
+
+@pytest.fixture
+def query_baseline(request, monkeypatch):
+    """
+    Check every APIClient call in the test against query_baselines.json:
+    fail with an SQL diff when a call issues more queries than the baseline
+    for its endpoint, status and scenario, or repeats an identical query.
+    Opt in per module with pytest.mark.usefixtures("query_baseline"); wrap
+    calls in `with query_baseline.scenario("<label>"):` to baseline a path
+    of different cost separately.
+    """
+    config = request.config
+    if not hasattr(config, "_query_baseline"):
+        config._query_baseline = QueryBaseline(QUERY_BASELINE_PATH)
+    guard = QueryGuard(
+        config._query_baseline,
+        None,
+        update=config.getoption("--update-query-baselines"),
+    )
+    monkeypatch.setattr(APIClient, "request", guard.wrap(APIClient.request))
+    return guard